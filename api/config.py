@@ -1,5 +1,7 @@
 from pathlib import Path
+from typing import Any
 
+from pydantic import PrivateAttr
 from pydantic_settings import BaseSettings
 
 
@@ -35,17 +37,28 @@ class Settings(BaseSettings):
         env_file = ".env"
         env_file_encoding = "utf-8"
 
+    # Derived values, resolved once in model_post_init. `settings` below is a
+    # process-wide singleton, so environment changes require constructing a new Settings().
+    _max_file_size_bytes: int = PrivateAttr()
+    _uploads_path: Path = PrivateAttr()
+    _outputs_path: Path = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        self._max_file_size_bytes = self.max_file_size_mb * 1024 * 1024
+        self._uploads_path = Path(self.uploads_dir).resolve()
+        self._outputs_path = Path(self.outputs_dir).resolve()
+
     @property
     def max_file_size_bytes(self) -> int:
-        return self.max_file_size_mb * 1024 * 1024
+        return self._max_file_size_bytes
 
     @property
     def uploads_path(self) -> Path:
-        return Path(self.uploads_dir).resolve()
+        return self._uploads_path
 
     @property
     def outputs_path(self) -> Path:
-        return Path(self.outputs_dir).resolve()
+        return self._outputs_path
 
 
 settings = Settings()
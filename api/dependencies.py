@@ -8,7 +8,7 @@ from collections.abc import Generator
 from sqlalchemy.orm import Session
 
 from api.config import settings
-from core.database import get_db_session, migrate_from_json
+from core.database import get_db_session, init_db, migrate_from_json
 from core.file_manager import FileManager
 from core.job_manager import JobManager
 
@@ -20,11 +20,16 @@ _job_manager_instance = None
 _file_manager_instance = None
 
 
-def get_job_manager() -> JobManager:
-    """Get or create singleton JobManager instance."""
+async def get_job_manager() -> JobManager:
+    """Get or create singleton JobManager instance.
+
+    Declared async so FastAPI resolves it inline on the event loop instead of
+    dispatching a threadpool call for what is just a singleton lookup.
+    """
     global _job_manager_instance
     if _job_manager_instance is None:
         logger.info("Creating JobManager singleton instance")
+        init_db()
         _job_manager_instance = JobManager(
             outputs_dir=settings.outputs_path,
             max_workers=settings.max_workers,
@@ -38,7 +43,7 @@ def get_job_manager() -> JobManager:
     return _job_manager_instance
 
 
-def get_file_manager() -> FileManager:
+async def get_file_manager() -> FileManager:
     """Get or create singleton FileManager instance."""
     global _file_manager_instance
     if _file_manager_instance is None:
@@ -52,6 +57,9 @@ def get_file_manager() -> FileManager:
 
 
 def get_db() -> Generator[Session, None, None]:
-    """Dependency for getting database session."""
+    """Dependency for getting database session.
+
+    Kept synchronous so the blocking SQLAlchemy commit/close runs in the threadpool.
+    """
     with get_db_session() as db:
         yield db
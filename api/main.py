@@ -1,10 +1,10 @@
 import logging
 from contextlib import asynccontextmanager
+from datetime import datetime
 
-import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from api.config import settings
 from api.dependencies import get_job_manager
@@ -21,15 +21,25 @@ logger = logging.getLogger(__name__)
 
 # Managers are now initialized in dependencies.py as singletons
 
+# Extractors are registered at import time, so the supported formats never change
+SUPPORTED_FORMATS = extractor_factory.get_supported_extensions()
+
+# Constant part of the health response; only the timestamp varies per request
+_HEALTH_RESPONSE_BASE = {
+    "status": "healthy",
+    "version": "1.0.0",
+    "supported_formats": SUPPORTED_FORMATS,
+}
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting doc2text_extractor API")
-    logger.info(f"Supported file extensions: {extractor_factory.get_supported_extensions()}")
+    logger.info(f"Supported file extensions: {SUPPORTED_FORMATS}")
 
     # Get shared JobManager instance and start background tasks
-    job_manager = get_job_manager()
+    job_manager = await get_job_manager()
     await job_manager.start_cleanup_task()
 
     yield
@@ -47,6 +57,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -55,29 +66,35 @@ app.add_middleware(
     allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST"],
-    allow_headers=["*"],
+    allow_headers=["content-type", "authorization", "if-none-match"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
 
 # Exception handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc: HTTPException):
-    return JSONResponse(
+    # Serialize straight to JSON bytes rather than dumping to a dict and re-encoding
+    return Response(
         status_code=exc.status_code,
-        content=ErrorResponse(error=exc.detail, detail=getattr(exc, "detail", None)).model_dump(
-            mode="json"
-        ),
+        content=ErrorResponse(
+            error=exc.detail, detail=getattr(exc, "detail", None)
+        ).model_dump_json(),
+        media_type="application/json",
     )
 
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc: Exception):
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    # Same shape as ErrorResponse, built directly to skip model construction
+    return ORJSONResponse(
         status_code=500,
-        content=ErrorResponse(
-            error="Internal server error", detail="An unexpected error occurred"
-        ).model_dump(mode="json"),
+        content={
+            "error": "Internal server error",
+            "detail": "An unexpected error occurred",
+            "timestamp": datetime.now().isoformat(),
+        },
     )
 
 
@@ -93,7 +110,7 @@ async def health_check():
 
     Returns the current status of the API and supported file formats.
     """
-    return HealthResponse(supported_formats=extractor_factory.get_supported_extensions())
+    return ORJSONResponse(_HEALTH_RESPONSE_BASE | {"timestamp": datetime.now().isoformat()})
 
 
 @app.get("/")
@@ -111,6 +128,8 @@ async def root():
 
 def run_server():
     """Entry point for running the server via CLI."""
+    import uvicorn
+
     uvicorn.run(
         "api.main:app",
         host=settings.host,
@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class JobStatus(str, Enum):
@@ -18,6 +18,8 @@ class JobCreateResponse(BaseModel):
 
 
 class JobStatusResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     job_id: str
     status: JobStatus
     filename: str
@@ -1,6 +1,14 @@
 import logging
 
-from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Response,
+    UploadFile,
+)
 from fastapi.responses import FileResponse
 
 from api.dependencies import get_file_manager, get_job_manager
@@ -12,12 +20,21 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+
+class _ZipFileResponse(FileResponse):
+    """FileResponse reading 1 MB at a time, fewer thread hops than the 64 KB default.
+
+    Servers supporting the ASGI pathsend extension send the file zero-copy instead.
+    """
+
+    chunk_size = 1024 * 1024
+
+
 # Managers are now injected as dependencies
 
 
 @router.post("/extract", response_model=JobCreateResponse)
 async def extract_document(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     job_manager: JobManager = Depends(get_job_manager),
     file_manager: FileManager = Depends(get_file_manager),
@@ -30,20 +47,18 @@ async def extract_document(
     """
     try:
         # Save uploaded file
-        file_path = await file_manager.save_upload_file(file)
+        file_path, file_size, file_type, content_hash = await file_manager.save_upload_file(file)
 
         # Create job
         job_id = job_manager.create_job(
             filename=file.filename,
-            file_size=file.size or file_path.stat().st_size,
-            file_type=file_path.suffix.lower(),
+            file_size=file_size,
+            file_type=file_type,
+            content_hash=content_hash,
         )
 
-        # Start background processing
-        background_tasks.add_task(job_manager.process_job, job_id, file_path)
-
-        # Start cleanup task if not already running
-        background_tasks.add_task(job_manager.start_cleanup_task)
+        # Hand off to the job manager's worker pool
+        job_manager.submit(job_id, file_path)
 
         return JobCreateResponse(
             job_id=job_id,
@@ -61,12 +76,16 @@ async def extract_document(
 @router.get("/extract/{job_id}/download")
 async def download_results(
     job_id: str,
+    if_none_match: str | None = Header(default=None),
     job_manager: JobManager = Depends(get_job_manager),
     file_manager: FileManager = Depends(get_file_manager),
 ):
     """
     Download the extraction results as a ZIP file.
 
+    The archive is built once and reused while the job output is unchanged.
+    Responses carry an ETag, and a matching If-None-Match returns 304.
+
     The ZIP file contains:
     - content.txt: Extracted text content
     - meta.txt: Document metadata
@@ -87,15 +106,23 @@ async def download_results(
         raise HTTPException(status_code=404, detail="Job results not found")
 
     # Create ZIP file
-    zip_path = file_manager.create_result_zip(job_id)
+    zip_path = await file_manager.create_result_zip_async(job_id)
     if not zip_path:
         raise HTTPException(status_code=500, detail="Failed to create results archive")
 
-    return FileResponse(
+    zip_stat = zip_path.stat()
+    etag = f'"{job_id}-{zip_stat.st_mtime_ns}"'
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    # Passing the stat result spares the response another stat call
+    return _ZipFileResponse(
         path=str(zip_path),
+        stat_result=zip_stat,
         media_type="application/zip",
         filename=f"{job_info.filename}_{job_id}_results.zip",
         headers={
-            "Content-Disposition": f"attachment; filename={job_info.filename}_{job_id}_results.zip"
+            "Content-Disposition": f"attachment; filename={job_info.filename}_{job_id}_results.zip",
+            "ETag": etag,
         },
     )
@@ -1,7 +1,9 @@
-import json
 import logging
+from functools import lru_cache
+from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 
 from api.dependencies import get_file_manager, get_job_manager
 from api.models import (
@@ -12,7 +14,7 @@ from api.models import (
     JobStatusResponse,
 )
 from core.file_manager import FileManager
-from core.job_manager import JobManager
+from core.job_manager import JobInfo, JobManager
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +23,34 @@ router = APIRouter()
 # Managers are now injected as dependencies
 
 
+@lru_cache(maxsize=1024)
+def _load_extraction_log(log_file: Path, mtime_ns: int) -> dict:
+    """Load an extraction log, cached per file modification time.
+
+    Logs are written once when a job completes, so keying on mtime lets repeated
+    result polls skip the read while still picking up a rewritten file.
+    """
+    with open(log_file, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def _job_status_etag(job_info: JobInfo) -> str:
+    """Build an ETag that changes whenever the job transitions state."""
+    changed_at = job_info.completed_at or job_info.started_at or job_info.created_at
+    changed_at_us = int(changed_at.timestamp() * 1_000_000) if changed_at else 0
+    return f'"{job_info.job_id}-{job_info.status.value}-{changed_at_us}"'
+
+
 @router.get("/jobs/{job_id}", response_model=JobStatusResponse)
-async def get_job_status(job_id: str, job_manager: JobManager = Depends(get_job_manager)):
+async def get_job_status(
+    job_id: str,
+    response: Response,
+    wait: float = Query(
+        default=0, ge=0, le=60, description="Seconds to wait for the job status to change"
+    ),
+    if_none_match: str | None = Header(default=None),
+    job_manager: JobManager = Depends(get_job_manager),
+):
     """
     Get the current status of an extraction job.
 
@@ -31,22 +59,25 @@ async def get_job_status(job_id: str, job_manager: JobManager = Depends(get_job_
     - File information
     - Timestamps
     - Error details if applicable
+
+    With `wait`, the request is held until the job's status changes or the
+    wait elapses, so clients can long-poll instead of polling on an interval.
+    Responses carry an ETag; a matching If-None-Match returns 304 with no body.
     """
-    job_info = job_manager.get_job(job_id)
+    if wait:
+        job_info = await job_manager.wait_for_job(job_id, timeout=wait)
+    else:
+        job_info = job_manager.get_job(job_id)
     if not job_info:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    return JobStatusResponse(
-        job_id=job_info.job_id,
-        status=job_info.status,
-        filename=job_info.filename,
-        file_size=job_info.file_size,
-        file_type=job_info.file_type,
-        created_at=job_info.created_at,
-        started_at=job_info.started_at,
-        completed_at=job_info.completed_at,
-        error_message=job_info.error_message,
-    )
+    etag = _job_status_etag(job_info)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if if_none_match == etag:
+        return Response(status_code=304, headers=dict(response.headers))
+
+    return JobStatusResponse.model_validate(job_info)
 
 
 @router.get("/jobs/{job_id}/result", response_model=JobResultResponse)
@@ -73,9 +104,13 @@ async def get_job_result(
         try:
             # Read extraction log for summary
             log_file = file_manager.get_job_output_dir(job_id) / "extraction_log.json"
-            if log_file.exists():
-                with open(log_file, encoding="utf-8") as f:
-                    log_data = json.load(f)
+            try:
+                log_mtime_ns: int | None = log_file.stat().st_mtime_ns
+            except FileNotFoundError:
+                log_mtime_ns = None
+
+            if log_mtime_ns is not None:
+                log_data = _load_extraction_log(log_file, log_mtime_ns)
 
                 response.result_summary = ExtractionResultSummary(
                     text_length=log_data.get("text_length", 0),
@@ -105,29 +140,11 @@ async def list_jobs(
     Jobs are returned in reverse chronological order (newest first).
     """
     try:
-        jobs = job_manager.list_jobs(limit=limit)
-
-        # Filter by status if specified
-        if status:
-            jobs = [job for job in jobs if job.status == status]
-
-        job_responses = []
-        for job in jobs:
-            job_responses.append(
-                JobStatusResponse(
-                    job_id=job.job_id,
-                    status=job.status,
-                    filename=job.filename,
-                    file_size=job.file_size,
-                    file_type=job.file_type,
-                    created_at=job.created_at,
-                    started_at=job.started_at,
-                    completed_at=job.completed_at,
-                    error_message=job.error_message,
-                )
-            )
+        jobs = job_manager.list_jobs(limit=limit, status=status)
+
+        job_responses = [JobStatusResponse.model_validate(job) for job in jobs]
 
-        return JobListResponse(jobs=job_responses, total=len(job_responses))
+        return JobListResponse(jobs=job_responses, total=job_manager.count_jobs(status=status))
 
     except Exception as e:
         logger.error(f"List jobs error: {e}")
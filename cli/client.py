@@ -1,18 +1,67 @@
 #!/usr/bin/env python3
 
-import json
+import asyncio
 import sys
-import time
+from collections.abc import Callable
 from pathlib import Path
 
 import click
 import httpx
 
+# Larger read size for result downloads keeps the write loop short for big archives
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Number of files uploaded in parallel by the batch command
+MAX_CONCURRENT_UPLOADS = 4
+
+# Async uploads up to this size are read in a worker thread before sending, so disk
+# reads don't block the event loop; larger files are streamed from the open file
+ASYNC_UPLOAD_READ_MAX_BYTES = 50 * 1024 * 1024
+
+
+def _raise_for_upload_error(response: httpx.Response) -> None:
+    if response.status_code != 200:
+        import json
+
+        try:
+            error_data = response.json()
+            raise click.ClickException(f"Upload failed: {error_data.get('error', response.text)}")
+        except json.JSONDecodeError:
+            raise click.ClickException(
+                f"Upload failed with status {response.status_code}: {response.text}"
+            ) from None
+
+
+def _job_status_from_response(
+    response: httpx.Response,
+    job_id: str,
+    cached: tuple[str, dict] | None,
+    status_cache: dict[str, tuple[str, dict]],
+) -> dict:
+    if response.status_code == 304 and cached:
+        return cached[1]
+    if response.status_code == 404:
+        raise click.ClickException(f"Job not found: {job_id}")
+    response.raise_for_status()
+
+    status = response.json()
+    if etag := response.headers.get("etag"):
+        status_cache[job_id] = (etag, status)
+    return status
+
 
 class Doc2TextClient:
     def __init__(self, base_url: str = "http://localhost:8081"):
         self.base_url = base_url.rstrip("/")
-        self.client = httpx.Client(timeout=30.0)
+        self.client = httpx.Client(
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_keepalive_connections=20, max_connections=20, keepalive_expiry=60.0
+            ),
+            transport=httpx.HTTPTransport(retries=1),
+        )
+        # Last (ETag, status) per job so unchanged polls can be answered with 304
+        self._status_cache: dict[str, tuple[str, dict]] = {}
 
     def __enter__(self):
         return self
@@ -33,25 +82,35 @@ class Doc2TextClient:
             files = {"file": (file_path.name, f, "application/octet-stream")}
             response = self.client.post(f"{self.base_url}/api/extract", files=files)
 
-        if response.status_code != 200:
-            try:
-                error_data = response.json()
-                raise click.ClickException(
-                    f"Upload failed: {error_data.get('error', response.text)}"
-                )
-            except json.JSONDecodeError:
-                raise click.ClickException(
-                    f"Upload failed with status {response.status_code}: {response.text}"
-                ) from None
-
+        _raise_for_upload_error(response)
         return response.json()
 
-    def get_job_status(self, job_id: str) -> dict:
-        response = self.client.get(f"{self.base_url}/api/jobs/{job_id}")
-        if response.status_code == 404:
-            raise click.ClickException(f"Job not found: {job_id}")
-        response.raise_for_status()
-        return response.json()
+    def get_job_status(self, job_id: str, wait: float = 0) -> dict:
+        cached = self._status_cache.get(job_id)
+        # When long-polling, allow the server to hold the request for `wait` seconds
+        response = self.client.get(
+            f"{self.base_url}/api/jobs/{job_id}",
+            params={"wait": wait} if wait else None,
+            headers={"If-None-Match": cached[0]} if cached else None,
+            timeout=wait + 30.0 if wait else httpx.USE_CLIENT_DEFAULT,
+        )
+        return _job_status_from_response(response, job_id, cached, self._status_cache)
+
+    def wait_for_completion(
+        self, job_id: str, wait: float = 30, on_status: Callable[[dict], None] | None = None
+    ) -> dict:
+        """Long-poll until the job completes or fails, reporting each status change."""
+        last_status = None
+
+        while True:
+            status = self.get_job_status(job_id, wait=wait)
+            if status["status"] != last_status:
+                last_status = status["status"]
+                if on_status:
+                    on_status(status)
+
+            if last_status in ["completed", "failed"]:
+                return status
 
     def get_job_result(self, job_id: str) -> dict:
         response = self.client.get(f"{self.base_url}/api/jobs/{job_id}/result")
@@ -73,7 +132,7 @@ class Doc2TextClient:
         # Save the file
         output_path.parent.mkdir(parents=True, exist_ok=True)
         with open(output_path, "wb") as f:
-            for chunk in response.iter_bytes():
+            for chunk in response.iter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
                 f.write(chunk)
 
     def list_jobs(self, limit: int = 10) -> dict:
@@ -82,6 +141,70 @@ class Doc2TextClient:
         return response.json()
 
 
+class AsyncDoc2TextClient:
+    """Async client used to fan out requests concurrently over a pooled connection set."""
+
+    def __init__(self, base_url: str = "http://localhost:8081", max_connections: int = 20):
+        self.base_url = base_url.rstrip("/")
+        self.client = httpx.AsyncClient(
+            timeout=30.0, limits=httpx.Limits(max_connections=max_connections)
+        )
+        self._status_cache: dict[str, tuple[str, dict]] = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.client.aclose()
+
+    async def submit_document(self, file_path: Path) -> dict:
+        if not file_path.exists():
+            raise click.ClickException(f"File not found: {file_path}")
+
+        if file_path.stat().st_size <= ASYNC_UPLOAD_READ_MAX_BYTES:
+            content = await asyncio.to_thread(file_path.read_bytes)
+            files = {"file": (file_path.name, content, "application/octet-stream")}
+            response = await self.client.post(f"{self.base_url}/api/extract", files=files)
+        else:
+            with open(file_path, "rb") as f:
+                files = {"file": (file_path.name, f, "application/octet-stream")}
+                response = await self.client.post(f"{self.base_url}/api/extract", files=files)
+
+        _raise_for_upload_error(response)
+        return response.json()
+
+    async def get_job_status(self, job_id: str, wait: float = 0) -> dict:
+        cached = self._status_cache.get(job_id)
+        response = await self.client.get(
+            f"{self.base_url}/api/jobs/{job_id}",
+            params={"wait": wait} if wait else None,
+            headers={"If-None-Match": cached[0]} if cached else None,
+            timeout=wait + 30.0 if wait else httpx.USE_CLIENT_DEFAULT,
+        )
+        return _job_status_from_response(response, job_id, cached, self._status_cache)
+
+    async def download_results(self, job_id: str, output_path: Path) -> None:
+        async with self.client.stream(
+            "GET", f"{self.base_url}/api/extract/{job_id}/download"
+        ) as response:
+            if response.status_code == 404:
+                raise click.ClickException(f"Results not found for job: {job_id}")
+            elif response.status_code == 400:
+                await response.aread()
+                error_data = response.json()
+                raise click.ClickException(
+                    f"Download failed: {error_data.get('error', response.text)}"
+                )
+
+            response.raise_for_status()
+
+            # Save the file
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(output_path, "wb") as f:
+                async for chunk in response.aiter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+
+
 @click.group()
 @click.option("--api-url", default="http://localhost:8081", help="API base URL")
 @click.pass_context
@@ -114,7 +237,11 @@ def health(ctx):
     type=click.Path(path_type=Path),
     help="Download results to this path when complete",
 )
-@click.option("--poll-interval", default=2, help="Polling interval in seconds when waiting")
+@click.option(
+    "--poll-interval",
+    default=30,
+    help="Maximum seconds each status request waits for a change when waiting",
+)
 @click.pass_context
 def extract(ctx, file_path, wait, download, poll_interval):
     """Submit a document for extraction"""
@@ -131,29 +258,24 @@ def extract(ctx, file_path, wait, download, poll_interval):
                 click.echo("Waiting for processing to complete...")
 
                 with click.progressbar(length=100, label="Processing") as bar:
-                    last_status = None
-
-                    while True:
-                        status = client.get_job_status(job_id)
-                        current_status = status["status"]
-
-                        if current_status != last_status:
-                            click.echo(f"Status: {current_status}")
-                            last_status = current_status
-
-                        if current_status == "completed":
-                            bar.update(100)
-                            break
-                        elif current_status == "failed":
-                            click.echo(
-                                f"Job failed: {status.get('error_message', 'Unknown error')}",
-                                err=True,
-                            )
-                            sys.exit(1)
-                        elif current_status == "processing":
+
+                    def report_status(status: dict) -> None:
+                        click.echo(f"Status: {status['status']}")
+                        if status["status"] == "processing":
                             bar.update(50)  # Approximate progress
 
-                        time.sleep(poll_interval)
+                    final_status = client.wait_for_completion(
+                        job_id, wait=poll_interval, on_status=report_status
+                    )
+
+                    if final_status["status"] == "failed":
+                        click.echo(
+                            f"Job failed: {final_status.get('error_message', 'Unknown error')}",
+                            err=True,
+                        )
+                        sys.exit(1)
+
+                    bar.update(bar.length - bar.pos)
 
                 click.echo("Processing completed!")
 
@@ -271,7 +393,9 @@ def list_jobs(ctx, limit):
     default=Path("./extractions"),
     help="Directory to save results",
 )
-@click.option("--poll-interval", default=2, help="Polling interval in seconds")
+@click.option(
+    "--poll-interval", default=30, help="Maximum seconds each status request waits for a change"
+)
 @click.pass_context
 def batch(ctx, files, output_dir, poll_interval):
     """Process multiple files in batch"""
@@ -282,55 +406,57 @@ def batch(ctx, files, output_dir, poll_interval):
     output_dir.mkdir(parents=True, exist_ok=True)
 
     try:
-        with Doc2TextClient(ctx.obj["api_url"]) as client:
-            # Submit all files
-            jobs = []
-            click.echo(f"Submitting {len(files)} files...")
-
-            for file_path in files:
-                result = client.submit_document(file_path)
-                jobs.append(
-                    {"job_id": result["job_id"], "filename": file_path.name, "status": "pending"}
-                )
-                click.echo(f"   {file_path.name} -> {result['job_id']}")
+        asyncio.run(_run_batch(ctx.obj["api_url"], files, output_dir, poll_interval))
+    except Exception as e:
+        click.echo(f"Batch processing error: {e}", err=True)
+        sys.exit(1)
 
-            # Monitor all jobs
-            click.echo(f"Monitoring {len(jobs)} jobs...")
-            completed = 0
 
-            while completed < len(jobs):
-                for job in jobs:
-                    if job["status"] in ["completed", "failed"]:
-                        continue
+async def _run_batch(api_url: str, files, output_dir: Path, poll_interval: float) -> None:
+    async with AsyncDoc2TextClient(api_url) as client:
+        # Submit all files, a few uploads at a time
+        jobs = []
+        click.echo(f"Submitting {len(files)} files...")
 
-                    status = client.get_job_status(job["job_id"])
-                    old_status = job["status"]
-                    job["status"] = status["status"]
+        upload_slots = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
 
-                    if job["status"] != old_status:
-                        if job["status"] == "completed":
-                            completed += 1
-                            click.echo(f"   {job['filename']} completed ({completed}/{len(jobs)})")
+        async def submit_one(file_path: Path) -> dict:
+            async with upload_slots:
+                return await client.submit_document(file_path)
 
-                            # Download immediately
-                            output_file = (
-                                output_dir / f"{job['filename']}_{job['job_id'][:8]}_results.zip"
-                            )
-                            client.download_results(job["job_id"], output_file)
-                            click.echo(f"      Results saved to {output_file}")
+        results = await asyncio.gather(*(submit_one(file_path) for file_path in files))
 
-                        elif job["status"] == "failed":
-                            completed += 1
-                            click.echo(f"   {job['filename']} failed")
+        for file_path, result in zip(files, results, strict=True):
+            jobs.append(
+                {"job_id": result["job_id"], "filename": file_path.name, "status": "pending"}
+            )
+            click.echo(f"   {file_path.name} -> {result['job_id']}")
 
-                if completed < len(jobs):
-                    time.sleep(poll_interval)
+        # Follow every job concurrently; each long-polls until its job finishes
+        click.echo(f"Monitoring {len(jobs)} jobs...")
+        completed = 0
 
-            click.echo(f"Batch processing complete! Results in {output_dir}")
+        async def follow_job(job: dict) -> None:
+            nonlocal completed
 
-    except Exception as e:
-        click.echo(f"Batch processing error: {e}", err=True)
-        sys.exit(1)
+            while job["status"] not in ["completed", "failed"]:
+                status = await client.get_job_status(job["job_id"], wait=poll_interval)
+                job["status"] = status["status"]
+
+            completed += 1
+            if job["status"] == "completed":
+                click.echo(f"   {job['filename']} completed ({completed}/{len(jobs)})")
+
+                # Download immediately
+                output_file = output_dir / f"{job['filename']}_{job['job_id'][:8]}_results.zip"
+                await client.download_results(job["job_id"], output_file)
+                click.echo(f"      Results saved to {output_file}")
+            else:
+                click.echo(f"   {job['filename']} failed")
+
+        await asyncio.gather(*(follow_job(job) for job in jobs))
+
+        click.echo(f"Batch processing complete! Results in {output_dir}")
 
 
 if __name__ == "__main__":
@@ -4,29 +4,90 @@ Database models and connection management using SQLAlchemy.
 
 import enum
 import logging
+import os
+import threading
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
-from sqlalchemy import Column, DateTime, Enum, Float, Integer, String, Text, create_engine
+import orjson
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Enum,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    create_engine,
+    event,
+    text,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool
 
 logger = logging.getLogger(__name__)
 
 # Database configuration
 DATABASE_PATH = Path("data/jobs.db")
-DATABASE_PATH.parent.mkdir(exist_ok=True)
 DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
 
-# Create engine with thread-safe settings for SQLite
+# Rows per executemany batch when migrating legacy JSON job data
+MIGRATION_BATCH_SIZE = 10_000
+
+# Single write connection: SQLite serializes writers anyway, so a larger pool
+# would only add lock contention
 engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool, echo=False
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=QueuePool,
+    pool_size=1,
+    max_overflow=0,
+    echo=False,
 )
 
-# Create session factory
+# Read-only connections for queries; with WAL these run alongside the writer
+read_engine = create_engine(
+    f"sqlite:///file:{DATABASE_PATH}?mode=ro&uri=true",
+    connect_args={"check_same_thread": False},
+    poolclass=QueuePool,
+    pool_size=max(4, os.cpu_count() or 1),
+    max_overflow=0,
+    echo=False,
+)
+
+
+def _set_connection_pragmas(cursor):
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    cursor.execute("PRAGMA cache_size=-20000")  # ~20 MB
+    cursor.execute("PRAGMA busy_timeout=5000")
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL journaling so readers don't block on writers, with fewer fsyncs per commit."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    _set_connection_pragmas(cursor)
+    cursor.close()
+
+
+@event.listens_for(read_engine, "connect")
+def _set_sqlite_read_pragmas(dbapi_connection, connection_record):
+    """Journal mode is a database-level setting owned by the writer; only tune the connection."""
+    cursor = dbapi_connection.cursor()
+    _set_connection_pragmas(cursor)
+    cursor.close()
+
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 # Create base class for models
 Base = declarative_base()
@@ -45,6 +106,10 @@ class Job(Base):
     """Job model for tracking document extraction jobs."""
 
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Serves status-filtered listings ordered by creation time
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+    )
 
     job_id = Column(String, primary_key=True, index=True)
     status = Column(Enum(JobStatus), nullable=False, default=JobStatus.PENDING)
@@ -63,6 +128,9 @@ class Job(Base):
     extractor_used = Column(String, nullable=True)
     processing_time = Column(Float, nullable=True)  # in seconds
 
+    # SHA-256 of the uploaded file, used to reuse results for identical uploads
+    content_hash = Column(String, nullable=True, index=True)
+
     def to_dict(self) -> dict:
         """Convert job to dictionary."""
         return {
@@ -83,14 +151,57 @@ class Job(Base):
         }
 
 
+_initialized = False
+_init_lock = threading.Lock()
+
+
 def init_db():
     """Initialize database by creating all tables."""
-    Base.metadata.create_all(bind=engine)
+    global _initialized
+    with _init_lock:
+        if _initialized:
+            return
+        DATABASE_PATH.parent.mkdir(exist_ok=True)
+        Base.metadata.create_all(bind=engine)
+        # create_all skips existing tables, so add any columns and indexes introduced since
+        _add_missing_columns()
+        for index in Job.__table__.indexes:
+            index.create(bind=engine, checkfirst=True)
+        _initialized = True
     logger.info(f"Database initialized at {DATABASE_PATH}")
 
 
+# Columns added to the jobs table after its first release. SQLite can only add
+# columns that are nullable or have a default, so each entry must be nullable.
+ADDED_JOB_COLUMNS = ("content_hash",)
+
+
+def _add_missing_columns():
+    """Add the columns in ADDED_JOB_COLUMNS to a jobs table created by an older version."""
+    with engine.begin() as connection:
+        existing = {row[1] for row in connection.execute(text("PRAGMA table_info(jobs)"))}
+        for name in ADDED_JOB_COLUMNS:
+            if name not in existing:
+                column = Job.__table__.columns[name]
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(text(f"ALTER TABLE jobs ADD COLUMN {name} {column_type}"))
+                logger.info(f"Added column {name} to jobs table")
+
+
+def _ensure_init():
+    if not _initialized:
+        init_db()
+
+
+def checkpoint_wal():
+    """Fold the WAL back into the main database file and truncate it."""
+    with engine.connect() as connection:
+        connection.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+
+
 def get_db() -> Session:
     """Get database session."""
+    _ensure_init()
     db = SessionLocal()
     try:
         return db
@@ -100,9 +211,13 @@ def get_db() -> Session:
 
 
 @contextmanager
-def get_db_session():
-    """Context manager for database sessions."""
-    db = SessionLocal()
+def get_db_session(readonly: bool = False):
+    """Context manager for database sessions.
+
+    Pass readonly=True for queries so they use the read-only connection pool.
+    """
+    _ensure_init()
+    db = ReadSessionLocal() if readonly else SessionLocal()
     try:
         yield db
         db.commit()
@@ -114,60 +229,51 @@ def get_db_session():
         db.close()
 
 
+def _parse_iso(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _job_row_from_json(job_id: str, job_data: dict) -> dict:
+    """Convert a legacy JSON job entry into a row for the jobs table."""
+    return {
+        "job_id": job_id,
+        "status": JobStatus(job_data["status"]),
+        "filename": job_data["filename"],
+        "file_size": job_data["file_size"],
+        "file_type": job_data["file_type"],
+        "created_at": _parse_iso(job_data["created_at"]),
+        "started_at": _parse_iso(job_data.get("started_at")),
+        "completed_at": _parse_iso(job_data.get("completed_at")),
+        "error_message": job_data.get("error_message"),
+        "output_path": job_data.get("output_path"),
+    }
+
+
 def migrate_from_json(json_file_path: Path):
     """Migrate existing jobs from JSON file to SQLite database."""
-    import json
-
     if not json_file_path.exists():
         logger.info("No existing JSON file to migrate")
         return
 
     try:
-        with open(json_file_path) as f:
-            jobs_data = json.load(f)
-
-        migrated_count = 0
         with get_db_session() as db:
-            for job_id, job_data in jobs_data.items():
-                # Check if job already exists
-                existing = db.query(Job).filter(Job.job_id == job_id).first()
-                if existing:
-                    continue
-
-                # Create new job
-                job = Job(
-                    job_id=job_id,
-                    status=JobStatus(job_data["status"]),
-                    filename=job_data["filename"],
-                    file_size=job_data["file_size"],
-                    file_type=job_data["file_type"],
-                    created_at=(
-                        datetime.fromisoformat(job_data["created_at"])
-                        if job_data["created_at"]
-                        else None
-                    ),
-                    started_at=(
-                        datetime.fromisoformat(job_data["started_at"])
-                        if job_data.get("started_at")
-                        else None
-                    ),
-                    completed_at=(
-                        datetime.fromisoformat(job_data["completed_at"])
-                        if job_data.get("completed_at")
-                        else None
-                    ),
-                    error_message=job_data.get("error_message"),
-                    output_path=job_data.get("output_path"),
-                )
-                db.add(job)
-                migrated_count += 1
+            # Jobs that were already migrated are skipped by SQLite itself
+            stmt = sqlite_insert(Job).on_conflict_do_nothing(index_elements=[Job.job_id])
+            connection = db.connection()
+
+            migrated_count = 0
+            rows = []
+            for job_id, job_data in orjson.loads(json_file_path.read_bytes()).items():
+                rows.append(_job_row_from_json(job_id, job_data))
+                if len(rows) >= MIGRATION_BATCH_SIZE:
+                    migrated_count += connection.execute(stmt, rows).rowcount
+                    rows = []
+
+            if rows:
+                migrated_count += connection.execute(stmt, rows).rowcount
 
             db.commit()
             logger.info(f"Migrated {migrated_count} jobs from JSON to SQLite")
 
     except Exception as e:
         logger.error(f"Failed to migrate from JSON: {e}")
-
-
-# Initialize database on module import
-init_db()
@@ -2,9 +2,19 @@ import mimetypes
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+# zlib level for images converted to PNG; level 1 is many times faster than the
+# default 6 for slightly larger files, and the result zip compresses them again
+PNG_COMPRESS_LEVEL = 1
+
+
+@lru_cache(maxsize=512)
+def _guess_mime_type(suffix: str) -> str | None:
+    return mimetypes.guess_type(f"file{suffix}")[0]
+
 
 @dataclass
 class ExtractionResult:
@@ -98,7 +108,7 @@ class BaseExtractor(ABC):
 
     def get_file_metadata(self, file_path: Path) -> DocumentMetadata:
         stat_info = file_path.stat()
-        mime_type, _ = mimetypes.guess_type(str(file_path))
+        mime_type = _guess_mime_type(file_path.suffix.lower())
 
         return DocumentMetadata(
             filename=file_path.name,
@@ -112,9 +122,10 @@ class BaseExtractor(ABC):
 
     def can_extract(self, file_path: Path) -> bool:
         extension = file_path.suffix.lower()
-        mime_type, _ = mimetypes.guess_type(str(file_path))
+        if extension in self.supported_extensions:
+            return True
 
-        return extension in self.supported_extensions or mime_type in self.supported_mime_types
+        return _guess_mime_type(extension) in self.supported_mime_types
 
     @abstractmethod
     def extract(self, file_path: Path, output_dir: Path) -> ExtractionResult:
@@ -122,30 +133,34 @@ class BaseExtractor(ABC):
 
     def save_metadata(self, metadata: DocumentMetadata, output_dir: Path) -> None:
         meta_file = output_dir / "meta.txt"
-        with open(meta_file, "w", encoding="utf-8") as f:
-            f.write(metadata.to_text())
+        meta_file.write_bytes(metadata.to_text().encode("utf-8"))
 
 
 class ExtractorFactory:
     def __init__(self):
-        self._extractors = {}
+        # Extractors hold no per-file state, so one shared instance per type is enough
+        self._extractors: dict[str, BaseExtractor] = {}
+        self._extractors_by_extension: dict[str, BaseExtractor] = {}
 
     def register(self, name: str, extractor_class):
-        self._extractors[name] = extractor_class
+        extractor = extractor_class()
+        self._extractors[name] = extractor
+        for extension in extractor.supported_extensions:
+            self._extractors_by_extension.setdefault(extension, extractor)
 
     def create_extractor(self, file_path: Path) -> BaseExtractor | None:
-        for _name, extractor_class in self._extractors.items():
-            extractor = extractor_class()
+        extractor = self._extractors_by_extension.get(file_path.suffix.lower())
+        if extractor:
+            return extractor
+
+        # Fall back to MIME type matching for unrecognised extensions
+        for extractor in self._extractors.values():
             if extractor.can_extract(file_path):
                 return extractor
         return None
 
     def get_supported_extensions(self) -> list[str]:
-        extensions = set()
-        for extractor_class in self._extractors.values():
-            extractor = extractor_class()
-            extensions.update(extractor.supported_extensions)
-        return list(extensions)
+        return list(self._extractors_by_extension)
 
 
 extractor_factory = ExtractorFactory()
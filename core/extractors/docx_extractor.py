@@ -1,18 +1,19 @@
 import io
 import logging
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from docx import Document
-from docx.oxml.table import CT_Tbl
-from docx.oxml.text.paragraph import CT_P
-from docx.table import Table
-from docx.text.paragraph import Paragraph
 from PIL import Image
 
-from .base import BaseExtractor, ExtractionResult
+from .base import PNG_COMPRESS_LEVEL, BaseExtractor, ExtractionResult
+
+if TYPE_CHECKING:
+    from docx.opc.part import Part
 
 logger = logging.getLogger(__name__)
 
+WEB_IMAGE_TYPES = {"image/png", "image/jpeg", "image/gif", "image/webp"}
+
 
 class DOCXExtractor(BaseExtractor):
     def __init__(self):
@@ -24,6 +25,13 @@ class DOCXExtractor(BaseExtractor):
         ]
 
     def extract(self, file_path: Path, output_dir: Path) -> ExtractionResult:
+        # python-docx is loaded on first use rather than with the package
+        from docx import Document
+        from docx.oxml.table import CT_Tbl
+        from docx.oxml.text.paragraph import CT_P
+        from docx.table import Table
+        from docx.text.paragraph import Paragraph
+
         try:
             images_dir = output_dir / "images"
             images_dir.mkdir(exist_ok=True)
@@ -56,52 +64,12 @@ class DOCXExtractor(BaseExtractor):
                 "word_count": len(doc.paragraphs),
             }
 
-            img_counter = 1
-
             for element in doc.element.body:
                 if isinstance(element, CT_P):
                     paragraph = Paragraph(element, doc)
                     para_text = paragraph.text.strip()
                     if para_text:
                         text_content.append(para_text)
-
-                    for run in paragraph.runs:
-                        if hasattr(run.element, "xpath"):
-                            try:
-                                # Try with namespaces parameter (older python-docx versions)
-                                images = run.element.xpath(
-                                    ".//a:blip/@r:embed",
-                                    namespaces={
-                                        "a": (
-                                            "http://schemas.openxmlformats.org/drawingml/2006/main"
-                                        ),
-                                        "r": (
-                                            "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
-                                        ),
-                                    },
-                                )
-                            except TypeError:
-                                # Fallback for newer python-docx versions without namespaces parameter
-                                try:
-                                    images = run.element.xpath(".//a:blip/@r:embed")
-                                except Exception:
-                                    # If xpath fails completely, skip image extraction for this run
-                                    images = []
-                            for image_id in images:
-                                try:
-                                    image_part = doc.part.related_parts[image_id]
-                                    image_filename = f"docx_img_{img_counter}.png"
-                                    image_path = images_dir / image_filename
-
-                                    image = Image.open(io.BytesIO(image_part.blob))
-                                    image.save(image_path, "PNG")
-
-                                    extracted_images.append(str(image_path))
-                                    img_counter += 1
-                                except Exception as e:
-                                    logger.warning(f"Failed to extract image {image_id}: {e}")
-                                    continue
-
                 elif isinstance(element, CT_Tbl):
                     table = Table(element, doc)
                     table_text = []
@@ -117,11 +85,24 @@ class DOCXExtractor(BaseExtractor):
                         text_content.extend(table_text)
                         text_content.append("")
 
+            # Web formats are copied as-is; only other formats are converted to PNG
+            img_counter = 1
+            for rel_id, part in doc.part.related_parts.items():
+                if not part.content_type.startswith("image/"):
+                    continue
+                try:
+                    image_path = self._save_image(part, images_dir, f"docx_img_{img_counter}")
+
+                    extracted_images.append(str(image_path))
+                    img_counter += 1
+                except Exception as e:
+                    logger.warning(f"Failed to extract image {rel_id}: {e}")
+                    continue
+
             full_text = "\n".join(text_content)
 
             content_file = output_dir / "content.txt"
-            with open(content_file, "w", encoding="utf-8") as f:
-                f.write(full_text)
+            content_file.write_bytes(full_text.encode("utf-8"))
 
             self.save_metadata(metadata, output_dir)
 
@@ -132,3 +113,19 @@ class DOCXExtractor(BaseExtractor):
         except Exception as e:
             logger.error(f"DOCX extraction failed for {file_path}: {e}")
             return ExtractionResult(text="", images=[], metadata={}, success=False, error=str(e))
+
+    def _save_image(self, part: "Part", images_dir: Path, stem: str) -> Path:
+        if part.content_type not in WEB_IMAGE_TYPES:
+            try:
+                image_path = images_dir / f"{stem}.png"
+                Image.open(io.BytesIO(part.blob)).save(
+                    image_path, "PNG", compress_level=PNG_COMPRESS_LEVEL
+                )
+                return image_path
+            except Exception:
+                # Formats Pillow cannot decode (e.g. EMF) are kept in their original form
+                image_path.unlink(missing_ok=True)
+
+        image_path = images_dir / f"{stem}.{part.partname.ext}"
+        image_path.write_bytes(part.blob)
+        return image_path
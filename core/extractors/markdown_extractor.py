@@ -1,16 +1,65 @@
 import logging
 import re
+from html.parser import HTMLParser
 from pathlib import Path
 from typing import Any
 
-import markdown2
 import yaml
-from bs4 import BeautifulSoup
+from markdown_it import MarkdownIt
+from markdown_it.token import Token
 
 from .base import BaseExtractor, ExtractionResult
 
 logger = logging.getLogger(__name__)
 
+# libyaml's C parser when PyYAML was built with it, the pure-Python one otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_HEADER_RE = re.compile(r"^(#+)\s+(.+)")
+_MARKDOWN = MarkdownIt("commonmark").enable(["table", "strikethrough"])
+
+
+class _HTMLTextParser(HTMLParser):
+    """Collect the text of an HTML fragment, skipping script and style contents."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style") and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def _html_text(fragment: str) -> str:
+    """Strip the tags from raw HTML embedded in Markdown, keeping its text."""
+    parser = _HTMLTextParser()
+    parser.feed(fragment)
+    parser.close()
+    return "".join(parser.parts)
+
+
+def _inline_text(token: Token) -> str:
+    parts = []
+    for child in token.children or []:
+        if child.type in ("text", "code_inline"):
+            parts.append(child.content)
+        elif child.type == "html_inline":
+            parts.append(_html_text(child.content))
+        elif child.type in ("softbreak", "hardbreak"):
+            parts.append("\n")
+        elif child.type == "image":
+            parts.append(_inline_text(child))
+    return "".join(parts)
+
 
 class MarkdownExtractor(BaseExtractor):
     def __init__(self):
@@ -27,7 +76,7 @@ class MarkdownExtractor(BaseExtractor):
                 end_index = content.find("\n---\n", 4)
                 if end_index != -1:
                     yaml_content = content[4:end_index]
-                    front_matter = yaml.safe_load(yaml_content) or {}
+                    front_matter = yaml.load(yaml_content, Loader=_YAML_LOADER) or {}
                     body = content[end_index + 5 :]
             except yaml.YAMLError as e:
                 logger.warning(f"Failed to parse YAML front matter: {e}")
@@ -52,14 +101,33 @@ class MarkdownExtractor(BaseExtractor):
     def extract_headers(self, content: str) -> list[str]:
         headers = []
         for line in content.split("\n"):
-            if line.strip().startswith("#"):
-                match = re.match(r"^(#+)\s+(.+)", line.strip())
+            stripped = line.strip()
+            if stripped.startswith("#"):
+                match = _HEADER_RE.match(stripped)
                 if match:
                     level = len(match.group(1))
                     title = match.group(2)
                     headers.append(f"{'  ' * (level - 1)}{title}")
         return headers
 
+    def markdown_to_text(self, content: str) -> str:
+        """Walk the parsed token stream once, keeping inline text, code and HTML text."""
+        lines = []
+        for token in _MARKDOWN.parse(content):
+            if token.type == "inline":
+                text = _inline_text(token)
+            elif token.type in ("fence", "code_block"):
+                text = token.content
+            elif token.type == "html_block":
+                text = _html_text(token.content)
+            else:
+                continue
+
+            text = text.strip()
+            if text:
+                lines.append(text)
+        return "\n".join(lines)
+
     def extract(self, file_path: Path, output_dir: Path) -> ExtractionResult:
         try:
             with open(file_path, encoding="utf-8") as f:
@@ -92,12 +160,7 @@ class MarkdownExtractor(BaseExtractor):
             if headers:
                 metadata.document_properties["heading_structure"] = headers
 
-            html = markdown2.markdown(
-                markdown_content, extras=["fenced-code-blocks", "tables", "metadata", "footnotes"]
-            )
-
-            soup = BeautifulSoup(html, "html.parser")
-            plain_text = soup.get_text(separator="\n", strip=True)
+            plain_text = self.markdown_to_text(markdown_content)
 
             text_lines = []
             text_lines.append("=== Markdown Document ===\n")
@@ -119,8 +182,7 @@ class MarkdownExtractor(BaseExtractor):
             full_text = "\n".join(text_lines)
 
             content_file = output_dir / "content.txt"
-            with open(content_file, "w", encoding="utf-8") as f:
-                f.write(full_text)
+            content_file.write_bytes(full_text.encode("utf-8"))
 
             self.save_metadata(metadata, output_dir)
 
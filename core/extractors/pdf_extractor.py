@@ -1,13 +1,18 @@
 import logging
 from pathlib import Path
-
-import fitz  # PyMuPDF
-import pdfplumber
+from typing import TYPE_CHECKING
 
 from .base import BaseExtractor, ExtractionResult
 
+if TYPE_CHECKING:
+    import fitz
+
 logger = logging.getLogger(__name__)
 
+# Embedded image streams in these formats are copied as-is; anything else, or an
+# image with a soft mask, is decoded and saved as PNG
+WEB_IMAGE_FORMATS = {"png", "jpeg", "jpg"}
+
 
 class PDFExtractor(BaseExtractor):
     def __init__(self):
@@ -16,6 +21,10 @@ class PDFExtractor(BaseExtractor):
         self.supported_mime_types = ["application/pdf"]
 
     def extract(self, file_path: Path, output_dir: Path) -> ExtractionResult:
+        # PyMuPDF takes longer to import than every other backend combined, so it is
+        # loaded on first use rather than with the package
+        import fitz
+
         try:
             images_dir = output_dir / "images"
             images_dir.mkdir(exist_ok=True)
@@ -25,81 +34,37 @@ class PDFExtractor(BaseExtractor):
 
             metadata = self.get_file_metadata(file_path)
 
-            with pdfplumber.open(file_path) as pdf:
-                pdf_metadata = pdf.metadata or {}
+            with fitz.open(file_path) as doc:
+                pdf_metadata = doc.metadata or {}
 
-                metadata.title = pdf_metadata.get("Title")
-                metadata.author = pdf_metadata.get("Author")
-                metadata.subject = pdf_metadata.get("Subject")
-                metadata.pages = len(pdf.pages)
-
-                creator = pdf_metadata.get("Creator")
-                producer = pdf_metadata.get("Producer")
-                created = pdf_metadata.get("CreationDate")
-                modified = pdf_metadata.get("ModDate")
+                metadata.title = pdf_metadata.get("title") or None
+                metadata.author = pdf_metadata.get("author") or None
+                metadata.subject = pdf_metadata.get("subject") or None
+                metadata.pages = doc.page_count
 
                 metadata.document_properties = {
-                    "creator": creator,
-                    "producer": producer,
-                    "creation_date_pdf": str(created) if created else None,
-                    "modification_date_pdf": str(modified) if modified else None,
-                    "encrypted": pdf.metadata.get("Encrypted", False) if pdf.metadata else False,
-                    "pdf_version": getattr(pdf, "pdf_version", None),
+                    "creator": pdf_metadata.get("creator") or None,
+                    "producer": pdf_metadata.get("producer") or None,
+                    "creation_date_pdf": pdf_metadata.get("creationDate") or None,
+                    "modification_date_pdf": pdf_metadata.get("modDate") or None,
+                    "encrypted": doc.is_encrypted,
+                    "pdf_version": pdf_metadata.get("format") or None,
                 }
 
-                if pdf_metadata.get("Keywords"):
-                    metadata.keywords = [
-                        k.strip() for k in pdf_metadata.get("Keywords", "").split(",")
-                    ]
-
-                for page_num, page in enumerate(pdf.pages, 1):
-                    page_text = page.extract_text() or ""
-
-                    tables = page.extract_tables()
-                    if tables:
-                        page_text += "\n\n"
-                        for table in tables:
-                            if table:
-                                table_text = "\n".join(
-                                    [
-                                        " | ".join([str(cell) if cell else "" for cell in row])
-                                        for row in table
-                                    ]
-                                )
-                                page_text += f"\nTable on page {page_num}:\n{table_text}\n"
-
-                    text_content.append(f"--- Page {page_num} ---\n{page_text}\n")
-
-            doc = fitz.open(file_path)
-            for page_num in range(doc.page_count):
-                page = doc[page_num]
-                image_list = page.get_images()
-
-                for img_index, img in enumerate(image_list):
-                    try:
-                        xref = img[0]
-                        pix = fitz.Pixmap(doc, xref)
-
-                        if pix.n - pix.alpha < 4:
-                            image_filename = f"page_{page_num + 1}_img_{img_index + 1}.png"
-                            image_path = images_dir / image_filename
-                            pix.save(str(image_path))
-                            extracted_images.append(str(image_path))
-
-                        pix = None
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to extract image {img_index} from page {page_num}: {e}"
-                        )
-                        continue
-
-            doc.close()
+                if pdf_metadata.get("keywords"):
+                    metadata.keywords = [k.strip() for k in pdf_metadata["keywords"].split(",")]
+
+                # PyMuPDF does not support multithreading, so pages are processed in order;
+                # jobs already run in parallel in the extraction process pool
+                for page_index in range(doc.page_count):
+                    page_text, page_images = self._process_page(doc, page_index, images_dir)
+                    text_content.append(page_text)
+                    extracted_images.extend(page_images)
 
             full_text = "\n".join(text_content)
 
             content_file = output_dir / "content.txt"
-            with open(content_file, "w", encoding="utf-8") as f:
-                f.write(full_text)
+            content_file.write_bytes(full_text.encode("utf-8"))
 
             self.save_metadata(metadata, output_dir)
 
@@ -110,3 +75,54 @@ class PDFExtractor(BaseExtractor):
         except Exception as e:
             logger.error(f"PDF extraction failed for {file_path}: {e}")
             return ExtractionResult(text="", images=[], metadata={}, success=False, error=str(e))
+
+    def _process_page(
+        self, doc: "fitz.Document", page_index: int, images_dir: Path
+    ) -> tuple[str, list[str]]:
+        page = doc[page_index]
+        page_num = page_index + 1
+        page_text = page.get_text("text") or ""
+        extracted_images = []
+
+        tables = page.find_tables().tables
+        if tables:
+            page_text += "\n\n"
+            for table in tables:
+                rows = table.extract()
+                if rows:
+                    # PyMuPDF cells are already str or None, so no str() conversion is needed
+                    table_text = "\n".join(
+                        [" | ".join([cell or "" for cell in row]) for row in rows]
+                    )
+                    page_text += f"\nTable on page {page_num}:\n{table_text}\n"
+
+        for img_index, img in enumerate(page.get_images()):
+            try:
+                xref, smask = img[0], img[1]
+                # Copy the embedded stream rather than decoding and re-encoding it, unless
+                # its transparency lives in a separate mask or browsers cannot show it
+                image_info = doc.extract_image(xref) if smask == 0 else None
+                if (
+                    image_info
+                    and image_info["ext"] in WEB_IMAGE_FORMATS
+                    and image_info["colorspace"] < 4
+                ):
+                    ext, image_bytes = image_info["ext"], image_info["image"]
+                else:
+                    import fitz  # already loaded by extract
+
+                    pix = fitz.Pixmap(doc, xref)
+                    if pix.n - pix.alpha >= 4:
+                        pix = fitz.Pixmap(fitz.csRGB, pix)
+                    if smask:
+                        pix = fitz.Pixmap(pix, fitz.Pixmap(doc, smask))
+                    ext, image_bytes = "png", pix.tobytes("png")
+
+                image_path = images_dir / f"page_{page_num}_img_{img_index + 1}.{ext}"
+                image_path.write_bytes(image_bytes)
+                extracted_images.append(str(image_path))
+            except Exception as e:
+                logger.warning(f"Failed to extract image {img_index} from page {page_index}: {e}")
+                continue
+
+        return f"--- Page {page_num} ---\n{page_text}\n", extracted_images
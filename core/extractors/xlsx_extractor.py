@@ -1,15 +1,214 @@
 import io
 import logging
-from datetime import datetime
+import multiprocessing
+import os
+import posixpath
+import zipfile
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, time
+from itertools import islice, repeat
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from xml.etree import ElementTree
 
-from openpyxl import load_workbook
 from PIL import Image
 
-from .base import BaseExtractor, ExtractionResult
+from .base import PNG_COMPRESS_LEVEL, BaseExtractor, ExtractionResult
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+if TYPE_CHECKING:
+    from openpyxl import Workbook
+    from openpyxl.worksheet._read_only import ReadOnlyWorksheet
 
 logger = logging.getLogger(__name__)
 
+MAX_ROWS = 9999
+MAX_COLUMNS = 99
+
+WEB_IMAGE_FORMATS = {"png", "jpeg", "gif", "webp"}
+
+_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_R_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_XDR_NS = "{http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing}"
+_A_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+
+CONTENT_BUFFER_SIZE = 1024 * 1024
+
+# Sheets of large workbooks are parsed in separate processes; below this size the
+# cost of starting the workers outweighs the gain
+PARALLEL_SHEETS_MIN_BYTES = 5 * 1024 * 1024
+SHEET_WORKERS = min(4, os.cpu_count() or 1)
+
+
+# Cell text by exact value type, one dict lookup per cell instead of isinstance checks;
+# anything not listed (int, float, bool, date, ...) goes through str()
+_CELL_FORMATTERS: dict[type, Callable[[Any], str]] = {
+    str: str,
+    type(None): lambda _: "",
+    datetime: datetime.isoformat,
+}
+
+# calamine returns every number as a float, date-only cells as dates and empty cells as "";
+# values are printed the way openpyxl reads them back (ints and datetimes)
+_CALAMINE_CELL_FORMATTERS: dict[type, Callable[[Any], str]] = {
+    str: str,
+    float: lambda value: str(int(value)) if value.is_integer() else str(value),
+    datetime: datetime.isoformat,
+    date: lambda value: datetime.combine(value, time()).isoformat(),
+}
+
+
+def _read_rels(archive: zipfile.ZipFile, part_path: str) -> dict[str, tuple[str, str]]:
+    """Map the relationship ids of a package part to (type, archive path of the target)."""
+    folder, name = posixpath.split(part_path)
+    try:
+        root = ElementTree.fromstring(archive.read(posixpath.join(folder, "_rels", f"{name}.rels")))
+    except KeyError:
+        return {}
+
+    rels = {}
+    for rel in root.iter(f"{_REL_NS}Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target", "")
+        if target.startswith("/"):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(folder, target))
+        rels[rel.get("Id")] = (rel.get("Type", ""), target)
+    return rels
+
+
+def _sheet_part_paths(archive: zipfile.ZipFile) -> dict[str, str]:
+    """Map sheet names to the archive paths of their worksheet parts."""
+    workbook_path = next(
+        target
+        for rel_type, target in _read_rels(archive, "").values()
+        if rel_type.endswith("/officeDocument")
+    )
+    rels = _read_rels(archive, workbook_path)
+    root = ElementTree.fromstring(archive.read(workbook_path))
+    return {
+        sheet.get("name"): rels[sheet.get(f"{_R_NS}id")][1]
+        for sheet in root.iter(f"{_MAIN_NS}sheet")
+        if sheet.get(f"{_R_NS}id") in rels
+    }
+
+
+def _find_sheet_images(archive: zipfile.ZipFile, sheet_path: str | None) -> list[str]:
+    """Return the archive paths of the pictures drawn on a sheet, in drawing order.
+
+    Read-only openpyxl sheets do not load images, so the drawing parts are read directly.
+    """
+    if sheet_path is None:
+        return []
+
+    images = []
+    for rel_type, drawing_path in _read_rels(archive, sheet_path).values():
+        if not rel_type.endswith("/drawing"):
+            continue
+        drawing_rels = _read_rels(archive, drawing_path)
+        drawing = ElementTree.fromstring(archive.read(drawing_path))
+        for pic in drawing.iter(f"{_XDR_NS}pic"):
+            blip = pic.find(f".//{_A_NS}blip")
+            rel = drawing_rels.get(blip.get(f"{_R_NS}embed")) if blip is not None else None
+            if rel is not None and rel[0].endswith("/image"):
+                images.append(rel[1])
+    return images
+
+
+def _iter_calamine_rows(calamine_sheet: Any) -> Iterator[list[Any]]:
+    """Yield a calamine sheet's rows without the trailing empty cells openpyxl never reads."""
+    for row_values in calamine_sheet.to_python(skip_empty_area=False, nrows=MAX_ROWS):
+        while row_values and row_values[-1] == "":
+            row_values.pop()
+        yield row_values
+
+
+def _iter_sheet_lines(
+    archive: zipfile.ZipFile,
+    sheet_path: str | None,
+    worksheet: "ReadOnlyWorksheet",
+    sheet_index: int,
+    images_dir: Path,
+    extracted_images: list[str],
+    calamine_sheet: Any = None,
+) -> Iterator[str]:
+    """Yield the content lines of one sheet, saving its images along the way.
+
+    Cell values come from ``calamine_sheet`` when one is given, otherwise from openpyxl.
+    """
+    yield f"=== Sheet: {worksheet.title} ===\n"
+
+    for img_counter, media_path in enumerate(_find_sheet_images(archive, sheet_path), start=1):
+        try:
+            image_stem = f"xlsx_sheet_{sheet_index + 1}_img_{img_counter}"
+            image_data = archive.read(media_path)
+            image_format = posixpath.splitext(media_path)[1][1:].lower()
+            if image_format == "jpg":
+                image_format = "jpeg"
+
+            # Web formats are copied as-is; only other formats are converted
+            if image_format in WEB_IMAGE_FORMATS:
+                image_path = images_dir / f"{image_stem}.{image_format}"
+                image_path.write_bytes(image_data)
+            else:
+                image_path = images_dir / f"{image_stem}.png"
+                Image.open(io.BytesIO(image_data)).save(
+                    image_path, "PNG", compress_level=PNG_COMPRESS_LEVEL
+                )
+
+            extracted_images.append(str(image_path))
+        except Exception as e:
+            logger.warning(f"Failed to extract image from sheet {worksheet.title}: {e}")
+            continue
+
+    if calamine_sheet is not None:
+        rows = _iter_calamine_rows(calamine_sheet)
+        formatter = _CALAMINE_CELL_FORMATTERS.get
+        empty = ""
+    else:
+        # The stored dimensions often over-report (e.g. cleared ranges) and would pad
+        # every row to that size, so read only the rows and cells present in the XML
+        worksheet.reset_dimensions()
+        rows = islice(worksheet.iter_rows(values_only=True), MAX_ROWS)
+        formatter = _CELL_FORMATTERS.get
+        empty = None
+
+    for row_values in rows:
+        row_values = row_values[:MAX_COLUMNS]
+        # count scans the row in C rather than a Python generator
+        if row_values.count(empty) < len(row_values):
+            yield " | ".join([formatter(type(value), str)(value) for value in row_values])
+
+    yield "\n"
+
+
+def _extract_sheet(
+    file_path: Path, sheet_index: int, images_dir: Path
+) -> tuple[list[str], list[str]]:
+    """Extract a single sheet in a worker process, returning its lines and image paths."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            images = []
+            worksheet = workbook.worksheets[sheet_index]
+            sheet_path = _sheet_part_paths(archive).get(worksheet.title)
+            lines = list(
+                _iter_sheet_lines(archive, sheet_path, worksheet, sheet_index, images_dir, images)
+            )
+            return lines, images
+    finally:
+        workbook.close()
+
 
 class XLSXExtractor(BaseExtractor):
     def __init__(self):
@@ -21,100 +220,55 @@ class XLSXExtractor(BaseExtractor):
         ]
 
     def extract(self, file_path: Path, output_dir: Path) -> ExtractionResult:
+        # openpyxl is loaded on first use rather than with the package
+        from openpyxl import load_workbook
+
         try:
             images_dir = output_dir / "images"
             images_dir.mkdir(exist_ok=True)
 
-            workbook = load_workbook(file_path, data_only=True)
-            extracted_images = []
-            text_content = []
-
-            metadata = self.get_file_metadata(file_path)
-
-            props = workbook.properties
-            if props:
-                metadata.title = props.title
-                metadata.author = props.creator
-                metadata.subject = props.subject
-
-                if props.keywords:
-                    metadata.keywords = [k.strip() for k in props.keywords.split(",")]
-
-                metadata.document_properties = {
-                    "category": props.category,
-                    "comments": props.description,
-                    "company": getattr(props, "company", None),
-                    "manager": getattr(props, "manager", None),
-                    "created": props.created.isoformat() if props.created else None,
-                    "modified": props.modified.isoformat() if props.modified else None,
-                    "last_modified_by": props.lastModifiedBy,
-                    "revision": getattr(props, "revision", None),
-                    "version": getattr(props, "version", None),
-                    "sheets_count": len(workbook.worksheets),
-                    "sheet_names": [ws.title for ws in workbook.worksheets],
-                }
-
-            img_counter = 1
+            # Read-only mode streams rows from the XML instead of building every cell in memory
+            workbook = load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                extracted_images = []
 
-            for sheet_index, worksheet in enumerate(workbook.worksheets):
-                text_content.append(f"=== Sheet: {worksheet.title} ===\n")
-
-                if hasattr(worksheet, "_images") and worksheet._images:
-                    for image in worksheet._images:
-                        try:
-                            img_data = image.ref
-                            if hasattr(img_data, "blob"):
-                                image_filename = (
-                                    f"xlsx_sheet_{sheet_index + 1}_img_{img_counter}.png"
-                                )
-                                image_path = images_dir / image_filename
-
-                                pil_image = Image.open(io.BytesIO(img_data.blob))
-                                pil_image.save(image_path, "PNG")
-
-                                extracted_images.append(str(image_path))
-                                img_counter += 1
-                        except Exception as e:
-                            logger.warning(
-                                f"Failed to extract image from sheet {worksheet.title}: {e}"
-                            )
-                            continue
-
-                max_row = worksheet.max_row
-                max_col = worksheet.max_column
-
-                if max_row and max_col and max_row > 0 and max_col > 0:
-                    for row_num in range(1, min(max_row + 1, 10000)):
-                        row_data = []
-                        has_data = False
-
-                        for col_num in range(1, min(max_col + 1, 100)):
-                            cell = worksheet.cell(row=row_num, column=col_num)
-                            cell_value = cell.value
-
-                            if cell_value is not None:
-                                has_data = True
-                                if isinstance(cell_value, datetime):
-                                    cell_value = cell_value.isoformat()
-                                else:
-                                    cell_value = str(cell_value)
-                            else:
-                                cell_value = ""
-
-                            row_data.append(cell_value)
-
-                        if has_data:
-                            text_content.append(" | ".join(row_data))
-                        elif row_num > 100 and not has_data:
-                            break
-
-                text_content.append("\n")
-
-            full_text = "\n".join(text_content)
-
-            content_file = output_dir / "content.txt"
-            with open(content_file, "w", encoding="utf-8") as f:
-                f.write(full_text)
+                metadata = self.get_file_metadata(file_path)
+
+                props = workbook.properties
+                if props:
+                    metadata.title = props.title
+                    metadata.author = props.creator
+                    metadata.subject = props.subject
+
+                    if props.keywords:
+                        metadata.keywords = [k.strip() for k in props.keywords.split(",")]
+
+                    metadata.document_properties = {
+                        "category": props.category,
+                        "comments": props.description,
+                        "company": getattr(props, "company", None),
+                        "manager": getattr(props, "manager", None),
+                        "created": props.created.isoformat() if props.created else None,
+                        "modified": props.modified.isoformat() if props.modified else None,
+                        "last_modified_by": props.lastModifiedBy,
+                        "revision": getattr(props, "revision", None),
+                        "version": getattr(props, "version", None),
+                        "sheets_count": len(workbook.worksheets),
+                        "sheet_names": [ws.title for ws in workbook.worksheets],
+                    }
+
+                # Lines go straight to disk instead of being collected and joined in memory
+                content_file = output_dir / "content.txt"
+                lines = self._iter_sheet_lines(workbook, file_path, images_dir, extracted_images)
+                with open(content_file, "w", encoding="utf-8", buffering=CONTENT_BUFFER_SIZE) as f:
+                    for line_index, line in enumerate(lines):
+                        if line_index:
+                            f.write("\n")
+                        f.write(line)
+            finally:
+                workbook.close()
+
+            full_text = content_file.read_text(encoding="utf-8")
 
             self.save_metadata(metadata, output_dir)
 
@@ -125,3 +279,61 @@ class XLSXExtractor(BaseExtractor):
         except Exception as e:
             logger.error(f"XLSX extraction failed for {file_path}: {e}")
             return ExtractionResult(text="", images=[], metadata={}, success=False, error=str(e))
+
+    def _iter_sheet_lines(
+        self, workbook: "Workbook", file_path: Path, images_dir: Path, extracted_images: list[str]
+    ) -> Iterator[str]:
+        """Yield the content lines of every sheet, saving sheet images along the way."""
+        if CalamineWorkbook is not None:
+            # The Rust parser reads cell values far faster than openpyxl, so there is no
+            # need for worker processes
+            with (
+                CalamineWorkbook.from_path(str(file_path)) as calamine_workbook,
+                zipfile.ZipFile(file_path) as archive,
+            ):
+                sheet_paths = _sheet_part_paths(archive)
+                for sheet_index, worksheet in enumerate(workbook.worksheets):
+                    yield from _iter_sheet_lines(
+                        archive,
+                        sheet_paths.get(worksheet.title),
+                        worksheet,
+                        sheet_index,
+                        images_dir,
+                        extracted_images,
+                        calamine_workbook.get_sheet_by_name(worksheet.title),
+                    )
+            return
+
+        # Jobs are already extracted in a worker pool, where a nested pool would multiply
+        # the process count and hold whole sheets in memory, so sheets are only split
+        # across processes when extracting from a main process
+        sheet_count = len(workbook.worksheets)
+        if (
+            sheet_count > 1
+            and SHEET_WORKERS > 1
+            and multiprocessing.parent_process() is None
+            and file_path.stat().st_size >= PARALLEL_SHEETS_MIN_BYTES
+        ):
+            with ProcessPoolExecutor(
+                max_workers=min(SHEET_WORKERS, sheet_count),
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                sheets = executor.map(
+                    _extract_sheet, repeat(file_path), range(sheet_count), repeat(images_dir)
+                )
+                for lines, images in sheets:
+                    extracted_images.extend(images)
+                    yield from lines
+            return
+
+        with zipfile.ZipFile(file_path) as archive:
+            sheet_paths = _sheet_part_paths(archive)
+            for sheet_index, worksheet in enumerate(workbook.worksheets):
+                yield from _iter_sheet_lines(
+                    archive,
+                    sheet_paths.get(worksheet.title),
+                    worksheet,
+                    sheet_index,
+                    images_dir,
+                    extracted_images,
+                )
@@ -1,9 +1,16 @@
+import asyncio
+import hashlib
 import logging
+import os
 import re
+import shutil
+import time
+import uuid
 import zipfile
+from collections.abc import Iterator
 from pathlib import Path
+from typing import BinaryIO
 
-import aiofiles
 import magic
 from fastapi import HTTPException, UploadFile
 
@@ -11,6 +18,62 @@ from .extractors import extractor_factory
 
 logger = logging.getLogger(__name__)
 
+# Read uploads in 1 MB chunks to keep memory bounded for large files
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Fast deflate for text outputs; already-compressed files are stored as-is
+ZIP_COMPRESS_LEVEL = 1
+ZIP_COPY_CHUNK_SIZE = 1024 * 1024
+ZIP_STORED_EXTENSIONS = {
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".webp",
+    ".zip",
+    ".xlsx",
+    ".docx",
+    ".pdf",
+}
+
+# Runs of characters unsafe in filenames, together with any underscores around them,
+# so one substitution both replaces and collapses them
+_UNSAFE_FILENAME_RE = re.compile(r"(?:[^\w\-.]|_)+")
+
+
+def _scan_files(directory: str | os.PathLike[str]) -> Iterator[os.DirEntry[str]]:
+    """Recursively yield file entries; DirEntry caches the type from the directory listing."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scan_files(entry.path)
+            elif entry.is_file():
+                yield entry
+
+
+def _write_zip_entry(zipf: zipfile.ZipFile, entry: os.DirEntry[str], arcname: str) -> None:
+    """Copy a file into the archive in large chunks; ZipFile.write copies 8 KiB at a time.
+
+    ZipInfo.from_file keeps the file's mtime and mode. On Python 3.12,
+    ZipFile.open ignores the archive's compresslevel for an explicit ZipInfo,
+    so deflated entries copy zipf.compresslevel onto it the way ZipFile.write
+    does. They are also forced to zip64 so members over 2 GiB can be written.
+    """
+    zinfo = zipfile.ZipInfo.from_file(entry.path, arcname)
+    force_zip64 = False
+    if os.path.splitext(entry.name)[1].lower() in ZIP_STORED_EXTENSIONS:
+        zinfo.compress_type = zipfile.ZIP_STORED
+    else:
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        zinfo._compresslevel = zipf.compresslevel  # type: ignore[attr-defined]
+        force_zip64 = True
+
+    with (
+        open(entry.path, "rb", buffering=0) as src,
+        zipf.open(zinfo, "w", force_zip64=force_zip64) as dst,
+    ):
+        shutil.copyfileobj(src, dst, ZIP_COPY_CHUNK_SIZE)
+
 
 class FileManager:
     def __init__(self, uploads_dir: Path, outputs_dir: Path, max_file_size: int = 50 * 1024 * 1024):
@@ -18,23 +81,24 @@ class FileManager:
         self.outputs_dir = Path(outputs_dir)
         self.max_file_size = max_file_size
 
+        # Loading the libmagic database is expensive, so share one instance;
+        # python-magic serialises calls on it with its own lock
+        self._magic = magic.Magic(mime=True)
+
         # Create directories if they don't exist
         self.uploads_dir.mkdir(exist_ok=True)
         self.outputs_dir.mkdir(exist_ok=True)
 
-        # Supported file extensions
-        self.supported_extensions = extractor_factory.get_supported_extensions()
+        # Supported file extensions, as a set for the per-upload membership check
+        self.supported_extensions = frozenset(extractor_factory.get_supported_extensions())
 
         logger.info(
-            f"FileManager initialized with supported extensions: {self.supported_extensions}"
+            f"FileManager initialized with supported extensions: {sorted(self.supported_extensions)}"
         )
 
     def sanitize_filename(self, filename: str) -> str:
-        # Remove any path separators and dangerous characters
-        filename = re.sub(r"[^\w\-_\.]", "_", filename)
-
-        # Remove multiple consecutive underscores
-        filename = re.sub(r"_+", "_", filename)
+        # Replace path separators and dangerous characters, collapsing underscores
+        filename = _UNSAFE_FILENAME_RE.sub("_", filename)
 
         # Ensure it's not empty and has an extension
         if not filename or filename.startswith("."):
@@ -50,8 +114,7 @@ class FileManager:
                 return False, f"Unsupported file extension: {extension}"
 
             # Check MIME type
-            mime = magic.Magic(mime=True)
-            file_mime_type = mime.from_file(str(file_path))
+            file_mime_type = self._magic.from_file(str(file_path))
 
             # Create a temporary extractor to validate
             extractor = extractor_factory.create_extractor(file_path)
@@ -65,7 +128,7 @@ class FileManager:
             logger.error(f"File validation error for {file_path}: {e}")
             return False, f"File validation failed: {str(e)}"
 
-    async def save_upload_file(self, upload_file: UploadFile) -> Path:
+    async def save_upload_file(self, upload_file: UploadFile) -> tuple[Path, int, str, str]:
         if not upload_file.filename:
             raise HTTPException(status_code=400, detail="No filename provided")
 
@@ -80,27 +143,18 @@ class FileManager:
         safe_filename = self.sanitize_filename(upload_file.filename)
 
         # Create unique filename to avoid conflicts
-        import time
-
-        timestamp = str(int(time.time()))
+        # Jobs run concurrently, so the timestamp alone is not unique enough
+        timestamp = f"{int(time.time())}_{uuid.uuid4().hex[:8]}"
         name, ext = safe_filename.rsplit(".", 1) if "." in safe_filename else (safe_filename, "")
         unique_filename = f"{name}_{timestamp}.{ext}" if ext else f"{name}_{timestamp}"
 
         file_path = self.uploads_dir / unique_filename
 
         try:
-            # Save file asynchronously
-            async with aiofiles.open(file_path, "wb") as f:
-                content = await upload_file.read()
-
-                # Double-check file size
-                if len(content) > self.max_file_size:
-                    raise HTTPException(
-                        status_code=413,
-                        detail=f"File too large. Maximum size is {self.max_file_size // (1024 * 1024)}MB",
-                    )
-
-                await f.write(content)
+            # Copy the spooled upload to disk in one worker thread hop
+            total_size, content_hash = await asyncio.to_thread(
+                self._write_upload, upload_file.file, file_path
+            )
 
             # Validate file type
             is_valid, mime_type_or_error = self.validate_file_type(file_path)
@@ -110,10 +164,12 @@ class FileManager:
                 raise HTTPException(status_code=400, detail=mime_type_or_error)
 
             logger.info(f"Successfully saved upload file: {file_path}")
-            return file_path
+            return file_path, total_size, file_path.suffix.lower(), content_hash
 
         except HTTPException:
-            # Re-raise HTTP exceptions as-is
+            # Clean up partially written file and re-raise as-is
+            if file_path.exists():
+                file_path.unlink()
             raise
         except Exception as e:
             # Clean up file if something went wrong
@@ -126,6 +182,25 @@ class FileManager:
             logger.error(f"Failed to save upload file: {e}")
             raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}") from e
 
+    def _write_upload(self, source: BinaryIO, file_path: Path) -> tuple[int, str]:
+        """Copy an upload to disk in bounded chunks, enforcing the size limit as data arrives.
+
+        Returns the size and the SHA-256 hex digest of the content, hashed while copying.
+        """
+        total_size = 0
+        content_hash = hashlib.sha256(usedforsecurity=False)
+        with open(file_path, "wb", buffering=UPLOAD_CHUNK_SIZE) as f:
+            while chunk := source.read(UPLOAD_CHUNK_SIZE):
+                total_size += len(chunk)
+                if total_size > self.max_file_size:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Maximum size is {self.max_file_size // (1024 * 1024)}MB",
+                    )
+                content_hash.update(chunk)
+                f.write(chunk)
+        return total_size, content_hash.hexdigest()
+
     def create_result_zip(self, job_id: str) -> Path | None:
         job_output_dir = self.outputs_dir / job_id
 
@@ -134,16 +209,32 @@ class FileManager:
             return None
 
         try:
-            # Create temporary zip file
             zip_path = job_output_dir / f"{job_id}_results.zip"
-
-            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+            tmp_zip_path = zip_path.with_suffix(".zip.tmp")
+
+            output_files = [
+                entry
+                for entry in _scan_files(job_output_dir)
+                if entry.name not in (zip_path.name, tmp_zip_path.name)
+            ]
+
+            # Reuse the existing archive if no output file changed since it was built
+            if zip_path.exists():
+                newest_mtime = max((e.stat().st_mtime_ns for e in output_files), default=0)
+                if zip_path.stat().st_mtime_ns >= newest_mtime:
+                    return zip_path
+
+            # Build into a temporary file and rename so readers never see a partial zip
+            with zipfile.ZipFile(
+                tmp_zip_path, "w", zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESS_LEVEL
+            ) as zipf:
                 # Add all files in the job output directory
-                for file_path in job_output_dir.rglob("*"):
-                    if file_path.is_file() and file_path.name != zip_path.name:
-                        # Calculate relative path for archive
-                        arcname = file_path.relative_to(job_output_dir)
-                        zipf.write(file_path, arcname)
+                for entry in output_files:
+                    # Calculate relative path for archive
+                    arcname = os.path.relpath(entry.path, job_output_dir)
+                    _write_zip_entry(zipf, entry, arcname)
+
+            tmp_zip_path.replace(zip_path)
 
             logger.info(f"Created result zip: {zip_path}")
             return zip_path
@@ -152,6 +243,10 @@ class FileManager:
             logger.error(f"Failed to create result zip for job {job_id}: {e}")
             return None
 
+    async def create_result_zip_async(self, job_id: str) -> Path | None:
+        """Build the result zip in a worker thread so the event loop stays responsive."""
+        return await asyncio.to_thread(self.create_result_zip, job_id)
+
     def cleanup_file(self, file_path: Path) -> bool:
         try:
             if file_path.exists():
@@ -167,32 +262,36 @@ class FileManager:
 
     def job_output_exists(self, job_id: str) -> bool:
         job_dir = self.outputs_dir / job_id
-        return job_dir.exists() and any(job_dir.iterdir())
+        try:
+            with os.scandir(job_dir) as entries:
+                return next(entries, None) is not None
+        except FileNotFoundError:
+            return False
 
     def get_job_files(self, job_id: str) -> list[Path]:
         job_dir = self.outputs_dir / job_id
         if not job_dir.exists():
             return []
 
-        return [f for f in job_dir.rglob("*") if f.is_file()]
+        return [Path(entry.path) for entry in _scan_files(job_dir)]
 
     def cleanup_uploads_dir(self, older_than_hours: int = 1):
         try:
-            import time
-
             current_time = time.time()
             cutoff_time = current_time - (older_than_hours * 3600)
 
             cleaned_count = 0
-            for file_path in self.uploads_dir.iterdir():
-                if file_path.is_file():
-                    file_age = file_path.stat().st_mtime
-                    if file_age < cutoff_time:
+            with os.scandir(self.uploads_dir) as entries:
+                for entry in entries:
+                    if (
+                        entry.is_file(follow_symlinks=False)
+                        and entry.stat(follow_symlinks=False).st_mtime < cutoff_time
+                    ):
                         try:
-                            file_path.unlink()
+                            os.unlink(entry.path)
                             cleaned_count += 1
                         except Exception as e:
-                            logger.warning(f"Failed to cleanup old upload {file_path}: {e}")
+                            logger.warning(f"Failed to cleanup old upload {entry.path}: {e}")
 
             if cleaned_count > 0:
                 logger.info(f"Cleaned up {cleaned_count} old upload files")
@@ -1,17 +1,68 @@
 import asyncio
 import json
 import logging
+import multiprocessing
+import os
 import shutil
 import uuid
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Any
 
-from .database import Job, JobStatus, get_db_session
+from sqlalchemy import Row, delete, insert, select, update
+from sqlalchemy.orm import load_only
+
+from api.models import JobStatus as APIJobStatus
+
+from .database import Job, JobStatus, checkpoint_wal, get_db_session
 from .extractors import extractor_factory
 
 logger = logging.getLogger(__name__)
 
+# Database status value to API status mapping, built once instead of per row
+_API_JOB_STATUS = {status.value: APIJobStatus(status.value) for status in JobStatus}
+
+# Only the columns JobInfo reads, so listings skip the processing statistics. Looked up
+# by name because the Column-style model types its attributes as Column, not as the
+# instrumented attributes load_only takes.
+_JOB_INFO_COLUMNS = load_only(
+    *(
+        getattr(Job, name)
+        for name in (
+            "job_id",
+            "status",
+            "filename",
+            "file_size",
+            "file_type",
+            "created_at",
+            "started_at",
+            "completed_at",
+            "error_message",
+            "output_path",
+        )
+    )
+)
+
+
+# DocumentMetadata fields read from the document itself rather than from the uploaded
+# file; the extraction log keeps them so a reused output can rebuild its meta.txt
+_DOCUMENT_META_FIELDS = ("author", "title", "subject", "keywords", "pages")
+
+
+def _document_metadata(metadata: dict[str, Any]) -> dict[str, Any]:
+    """Select the document fields of an extraction's metadata for the extraction log.
+
+    Document properties are stored as the text meta.txt shows for them, so values
+    such as front matter dates survive the JSON round trip unchanged.
+    """
+    document_metadata = {field: metadata.get(field) for field in _DOCUMENT_META_FIELDS}
+    document_metadata["document_properties"] = {
+        key: f"{value}" for key, value in (metadata.get("document_properties") or {}).items()
+    }
+    return document_metadata
+
 
 class JobInfo:
     """Legacy JobInfo class for compatibility."""
@@ -19,12 +70,7 @@ class JobInfo:
     def __init__(self, job: Job):
         self.job_id = job.job_id
         # Convert database enum to API enum
-        from api.models import JobStatus as APIJobStatus
-
-        if job.status:
-            self.status = APIJobStatus(job.status.value.lower())
-        else:
-            self.status = APIJobStatus.PENDING
+        self.status = _API_JOB_STATUS.get(job.status.value, APIJobStatus.PENDING)
         self.filename = job.filename
         self.file_size = job.file_size
         self.file_type = job.file_type
@@ -55,127 +101,223 @@ class JobManager:
         self.outputs_dir = Path(outputs_dir)
         self.outputs_dir.mkdir(exist_ok=True)
 
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Extraction is CPU-bound, so run it in worker processes to keep it off the
+        # API's GIL. Spawned workers avoid forking a process that already has threads.
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
         self.cleanup_hours = cleanup_hours
 
+        # Strong references to in-flight job tasks so they are not garbage collected
+        self._job_tasks: set[asyncio.Task] = set()
+
         # Background cleanup task
         self._cleanup_task = None
 
+        # Per-job events used to wake long-polling status requests on transitions, kept
+        # only while at least one request is waiting on the job
+        self._job_events: dict[str, asyncio.Event] = {}
+        self._job_waiters: dict[str, int] = {}
+
         logger.info("JobManager initialized with SQLite database")
 
-    def create_job(self, filename: str, file_size: int, file_type: str) -> str:
+    def create_job(
+        self, filename: str, file_size: int, file_type: str, content_hash: str | None = None
+    ) -> str:
         """Create a new job in the database."""
         job_id = str(uuid.uuid4())
 
+        # A Core insert skips building and tracking an ORM instance
         with get_db_session() as db:
-            job = Job(
-                job_id=job_id,
-                status=JobStatus.PENDING,
-                filename=filename,
-                file_size=file_size,
-                file_type=file_type,
-                created_at=datetime.now(),
+            db.execute(
+                insert(Job).values(
+                    job_id=job_id,
+                    status=JobStatus.PENDING,
+                    filename=filename,
+                    file_size=file_size,
+                    file_type=file_type,
+                    content_hash=content_hash,
+                    created_at=datetime.now(),
+                )
             )
-            db.add(job)
-            db.commit()
 
         logger.info(f"Created job {job_id} for file {filename}")
         return job_id
 
     def get_job(self, job_id: str) -> JobInfo | None:
         """Get job information from the database."""
-        with get_db_session() as db:
-            job = db.query(Job).filter(Job.job_id == job_id).first()
+        with get_db_session(readonly=True) as db:
+            job = db.query(Job).options(_JOB_INFO_COLUMNS).filter(Job.job_id == job_id).first()
             if job:
                 return JobInfo(job)
             return None
 
-    def list_jobs(self, limit: int = 100) -> list[JobInfo]:
-        """List jobs from the database."""
-        with get_db_session() as db:
-            jobs = db.query(Job).order_by(Job.created_at.desc()).limit(limit).all()
+    def list_jobs(self, limit: int = 100, status: str | None = None) -> list[JobInfo]:
+        """List jobs from the database, optionally filtered by status value."""
+        with get_db_session(readonly=True) as db:
+            query = db.query(Job).options(_JOB_INFO_COLUMNS)
+            if status:
+                query = query.filter(Job.status == JobStatus(status))
+            jobs = query.order_by(Job.created_at.desc()).limit(limit).all()
             return [JobInfo(job) for job in jobs]
 
+    def count_jobs(self, status: str | None = None) -> int:
+        """Count jobs in the database, optionally filtered by status value."""
+        with get_db_session(readonly=True) as db:
+            query = db.query(Job)
+            if status:
+                query = query.filter(Job.status == JobStatus(status))
+            return query.count()
+
+    def _notify_job_update(self, job_id: str) -> None:
+        """Wake any requests waiting on a status change for this job."""
+        event = self._job_events.pop(job_id, None)
+        if event:
+            event.set()
+
+    async def wait_for_job(self, job_id: str, timeout: float) -> JobInfo | None:
+        """Wait up to `timeout` seconds for the job to leave its current status."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        initial_status = None
+
+        self._job_waiters[job_id] = self._job_waiters.get(job_id, 0) + 1
+        try:
+            while True:
+                # Register before reading so a transition in between is not missed
+                event = self._job_events.setdefault(job_id, asyncio.Event())
+                job_info = self.get_job(job_id)
+                if job_info is None:
+                    return None
+
+                if initial_status is None:
+                    initial_status = job_info.status
+
+                remaining = deadline - loop.time()
+                if (
+                    job_info.status != initial_status
+                    or job_info.status.value in (JobStatus.COMPLETED.value, JobStatus.FAILED.value)
+                    or remaining <= 0
+                ):
+                    return job_info
+
+                try:
+                    await asyncio.wait_for(event.wait(), remaining)
+                except TimeoutError:
+                    pass
+        finally:
+            # The last waiter drops the event, so unknown or idle job ids do not pile up
+            waiters = self._job_waiters.pop(job_id) - 1
+            if waiters:
+                self._job_waiters[job_id] = waiters
+            else:
+                self._job_events.pop(job_id, None)
+
+    def submit(self, job_id: str, file_path: Path) -> None:
+        """Schedule a job for processing without waiting for it to finish."""
+        task = asyncio.create_task(self.process_job(job_id, file_path))
+        self._job_tasks.add(task)
+        task.add_done_callback(self._job_tasks.discard)
+
     async def process_job(self, job_id: str, file_path: Path) -> bool:
         """Process a job - extract document content."""
         start_time = datetime.now()
 
-        # Update job status to processing
+        # Update job status to processing, reading the job's fields in the same statement
         with get_db_session() as db:
-            job = db.query(Job).filter(Job.job_id == job_id).first()
-            if not job:
-                logger.error(f"Job {job_id} not found")
-                return False
-
-            job.status = JobStatus.PROCESSING
-            job.started_at = datetime.now()
-            db.commit()
-
+            row = db.execute(
+                update(Job)
+                .where(Job.job_id == job_id)
+                .values(status=JobStatus.PROCESSING, started_at=datetime.now())
+                .returning(Job.filename, Job.content_hash)
+            ).first()
+        if row is None:
+            logger.error(f"Job {job_id} not found")
+            return False
+        filename, content_hash = row
+
+        self._notify_job_update(job_id)
+
+        succeeded = False
         try:
             # Create output directory for this job
             output_dir = self.outputs_dir / job_id
             output_dir.mkdir(exist_ok=True)
 
-            # Get appropriate extractor
-            extractor = extractor_factory.create_extractor(file_path)
-            if not extractor:
-                raise ValueError(f"No extractor found for file type: {file_path.suffix}")
-
-            # Run extraction in thread pool
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                self.executor, extractor.extract, file_path, output_dir
-            )
+            # Identical content was extracted before, so reuse its output
+            source = reused = None
+            if content_hash:
+                reused = await asyncio.to_thread(
+                    self._reuse_completed_output, job_id, content_hash, file_path, output_dir
+                )
 
-            # Update job with results
-            with get_db_session() as db:
-                job = db.query(Job).filter(Job.job_id == job_id).first()
-
-                if result.success:
-                    job.status = JobStatus.COMPLETED
-                    job.output_path = str(output_dir)
-                    job.text_length = len(result.text) if result.text else 0
-                    job.images_count = len(result.images) if result.images else 0
-                    job.extractor_used = extractor.__class__.__name__
-
-                    # Save extraction log
-                    extraction_log = {
-                        "job_id": job_id,
-                        "filename": job.filename,
-                        "extractor_used": extractor.__class__.__name__,
-                        "extraction_timestamp": datetime.now().isoformat(),
-                        "text_length": job.text_length,
-                        "images_count": job.images_count,
-                        "success": True,
-                    }
-
-                    log_file = output_dir / "extraction_log.json"
-                    with open(log_file, "w", encoding="utf-8") as f:
-                        json.dump(extraction_log, f, indent=2)
-
-                    logger.info(f"Job {job_id} completed successfully")
-                else:
-                    job.status = JobStatus.FAILED
-                    job.error_message = result.error
-                    logger.error(f"Job {job_id} failed: {result.error}")
-
-                job.completed_at = datetime.now()
-                job.processing_time = (job.completed_at - start_time).total_seconds()
-                db.commit()
+            if reused is not None:
+                source, document_metadata = reused
+                success, error = True, None
+                text_length = source.text_length or 0
+                images_count = source.images_count or 0
+                extractor_name = source.extractor_used
+            else:
+                # Get appropriate extractor
+                extractor = extractor_factory.create_extractor(file_path)
+                if not extractor:
+                    raise ValueError(f"No extractor found for file type: {file_path.suffix}")
+
+                # Run extraction in the worker process pool
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    self.executor, extractor.extract, file_path, output_dir
+                )
+                success, error = result.success, result.error
+                document_metadata = _document_metadata(result.metadata)
+                text_length = len(result.text) if result.text else 0
+                images_count = len(result.images) if result.images else 0
+                extractor_name = extractor.__class__.__name__
+
+            if success:
+                # Save extraction log
+                extraction_log = {
+                    "job_id": job_id,
+                    "filename": filename,
+                    "extractor_used": extractor_name,
+                    "extraction_timestamp": datetime.now().isoformat(),
+                    "text_length": text_length,
+                    "images_count": images_count,
+                    "success": True,
+                    "document_metadata": document_metadata,
+                }
+                if source is not None:
+                    extraction_log["reused_from_job"] = source.job_id
+
+                log_file = output_dir / "extraction_log.json"
+                with open(log_file, "w", encoding="utf-8") as f:
+                    json.dump(extraction_log, f, indent=2, default=str)
+
+                values = {
+                    "status": JobStatus.COMPLETED,
+                    "output_path": str(output_dir),
+                    "text_length": text_length,
+                    "images_count": images_count,
+                    "extractor_used": extractor_name,
+                }
+                logger.info(f"Job {job_id} completed successfully")
+            else:
+                values = {"status": JobStatus.FAILED, "error_message": error}
+                logger.error(f"Job {job_id} failed: {error}")
+
+            # Update job with results in a single statement
+            self._finish_job(job_id, start_time, values)
+            succeeded = success
 
         except Exception as e:
             logger.error(f"Job {job_id} failed with exception: {e}")
-
-            with get_db_session() as db:
-                job = db.query(Job).filter(Job.job_id == job_id).first()
-                if job:
-                    job.status = JobStatus.FAILED
-                    job.error_message = str(e)
-                    job.completed_at = datetime.now()
-                    job.processing_time = (job.completed_at - start_time).total_seconds()
-                    db.commit()
+            self._finish_job(
+                job_id, start_time, {"status": JobStatus.FAILED, "error_message": str(e)}
+            )
 
         finally:
+            self._notify_job_update(job_id)
+
             # Clean up uploaded file
             try:
                 if file_path.exists():
@@ -183,44 +325,123 @@ class JobManager:
             except Exception as e:
                 logger.warning(f"Failed to cleanup uploaded file {file_path}: {e}")
 
-        # Check final status
+        return succeeded
+
+    def _reuse_completed_output(
+        self, job_id: str, content_hash: str, file_path: Path, output_dir: Path
+    ) -> tuple[Row, dict[str, Any]] | None:
+        """Hard-link the output of a completed job with the same content into output_dir.
+
+        Links rather than a symlinked directory keep the files alive when the older job
+        is cleaned up. meta.txt is rebuilt from this job's upload and the document
+        metadata in the source job's extraction log. Returns the source job and that
+        document metadata, or None if there is nothing to reuse.
+        """
+        with get_db_session(readonly=True) as db:
+            source = db.execute(
+                select(Job.job_id, Job.text_length, Job.images_count, Job.extractor_used)
+                .where(
+                    Job.content_hash == content_hash,
+                    Job.status == JobStatus.COMPLETED,
+                    Job.job_id != job_id,
+                )
+                .order_by(Job.completed_at.desc())
+                .limit(1)
+            ).first()
+        if source is None:
+            return None
+
+        source_dir = self.outputs_dir / source.job_id
+        extractor = extractor_factory.create_extractor(file_path)
+        if extractor is None or not source_dir.is_dir():
+            return None
+
+        try:
+            with open(source_dir / "extraction_log.json", encoding="utf-8") as f:
+                document_metadata = json.load(f).get("document_metadata")
+            # Jobs logged before the document metadata was kept cannot rebuild meta.txt
+            if document_metadata is None:
+                return None
+
+            for dirpath, _, filenames in os.walk(source_dir):
+                target_dir = output_dir / os.path.relpath(dirpath, source_dir)
+                target_dir.mkdir(parents=True, exist_ok=True)
+                for name in filenames:
+                    # The log and result zip belong to the source job
+                    if name == "extraction_log.json" or name.startswith(f"{source.job_id}_"):
+                        continue
+                    if dirpath == str(source_dir) and name == "meta.txt":
+                        continue
+                    try:
+                        os.link(os.path.join(dirpath, name), target_dir / name)
+                    except OSError:
+                        shutil.copy2(os.path.join(dirpath, name), target_dir / name)
+
+            metadata = replace(extractor.get_file_metadata(file_path), **document_metadata)
+            extractor.save_metadata(metadata, output_dir)
+        except Exception as e:
+            # Any partial copy is discarded so the job falls back to a fresh extraction
+            logger.warning(f"Could not reuse output of job {source.job_id} for {job_id}: {e}")
+            shutil.rmtree(output_dir, ignore_errors=True)
+            output_dir.mkdir(exist_ok=True)
+            return None
+
+        logger.info(f"Job {job_id} reuses the output of job {source.job_id}")
+        return source, document_metadata
+
+    def _finish_job(self, job_id: str, start_time: datetime, values: dict) -> None:
+        """Record a job's outcome together with its completion time."""
+        completed_at = datetime.now()
         with get_db_session() as db:
-            job = db.query(Job).filter(Job.job_id == job_id).first()
-            return job and job.status == JobStatus.COMPLETED
+            db.execute(
+                update(Job)
+                .where(Job.job_id == job_id)
+                .values(
+                    completed_at=completed_at,
+                    processing_time=(completed_at - start_time).total_seconds(),
+                    **values,
+                )
+            )
 
     async def cleanup_old_jobs(self):
         """Clean up old jobs from database and filesystem."""
+        # Directory removal and the delete transaction block, so run them off the event loop
+        removed_job_ids = await asyncio.to_thread(self._cleanup_old_jobs_sync)
+        for job_id in removed_job_ids:
+            self._job_events.pop(job_id, None)
+
+    def _cleanup_old_jobs_sync(self) -> list[str]:
         cutoff_time = datetime.now() - timedelta(hours=self.cleanup_hours)
 
+        # Delete the rows first and release the single writer connection before
+        # touching the filesystem, so job writes on the event loop never wait on rmtree
         with get_db_session() as db:
-            # Find old completed or abandoned pending jobs
-            old_jobs = (
-                db.query(Job)
-                .filter(
-                    ((Job.status == JobStatus.COMPLETED) & (Job.completed_at < cutoff_time))
-                    | ((Job.status == JobStatus.PENDING) & (Job.created_at < cutoff_time))
-                )
-                .all()
+            # Old completed or abandoned pending jobs
+            removed_job_ids = list(
+                db.execute(
+                    delete(Job)
+                    .where(
+                        ((Job.status == JobStatus.COMPLETED) & (Job.completed_at < cutoff_time))
+                        | ((Job.status == JobStatus.PENDING) & (Job.created_at < cutoff_time))
+                    )
+                    .returning(Job.job_id)
+                ).scalars()
             )
+            db.commit()
 
-            for job in old_jobs:
-                try:
-                    # Remove output directory
-                    output_dir = self.outputs_dir / job.job_id
-                    if output_dir.exists():
-                        shutil.rmtree(output_dir)
-
-                    # Remove from database
-                    db.delete(job)
-                    logger.info(f"Cleaned up old job {job.job_id}")
-
-                except Exception as e:
-                    logger.warning(f"Failed to cleanup job {job.job_id}: {e}")
+        for job_id in removed_job_ids:
+            output_dir = self.outputs_dir / job_id
+            try:
+                if output_dir.exists():
+                    shutil.rmtree(output_dir)
+                logger.info(f"Cleaned up old job {job_id}")
+            except Exception as e:
+                logger.warning(f"Failed to remove output directory of job {job_id}: {e}")
 
-            db.commit()
+        if removed_job_ids:
+            logger.info(f"Cleaned up {len(removed_job_ids)} old jobs")
 
-            if old_jobs:
-                logger.info(f"Cleaned up {len(old_jobs)} old jobs")
+        return removed_job_ids
 
     async def start_cleanup_task(self):
         """Start the background cleanup task."""
@@ -232,6 +453,8 @@ class JobManager:
         while True:
             try:
                 await self.cleanup_old_jobs()
+                # Keep the SQLite WAL from growing without bound
+                await asyncio.to_thread(checkpoint_wal)
                 await asyncio.sleep(3600)  # Run cleanup every hour
             except asyncio.CancelledError:
                 break
@@ -4,31 +4,106 @@ Comprehensive API testing script for Document to Text Extractor API.
 Tests all exposed API functionality with all supported file types.
 """
 
+import logging
 import os
+import queue
+import random
 import sys
-import tempfile
 import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Any
 
 import httpx
+import orjson
 
 API_BASE_URL = os.environ.get("API_URL", "http://localhost:8081")
 TEST_FILES_DIR = Path("tests/test_files")
 OUTPUT_DIR = Path("test_outputs")
 
+# Read size for result downloads, matching the CLI client
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Files every result archive should contain
+EXPECTED_RESULT_FILES = ("content.txt", "meta.txt", "extraction_log.json")
+
+# How long the pre-flight health response stands in for the health check
+HEALTH_CACHE_TTL = 30.0
+
+# Log lines are queued and written to stdout by a listener thread, so worker
+# threads never wait on terminal output
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+logger = logging.getLogger("api_tester")
+logger.addHandler(QueueHandler(_log_queue))
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+
+def resolve_test_files(
+    test_files: list[tuple[Path, str]],
+) -> tuple[list[tuple[Path, str]], list[Path]]:
+    """Split (path, description) pairs into those whose file exists and the missing paths."""
+    available, missing = [], []
+    for path, description in test_files:
+        if path.exists():
+            available.append((path, description))
+        else:
+            missing.append(path)
+    return available, missing
+
+
+@dataclass(slots=True)
+class CheckResult:
+    """Outcome of one API check."""
+
+    name: str
+    endpoint: str
+    method: str
+    passed: bool
+    response: Any = None
+
 
 class APITester:
     def __init__(self, base_url: str = API_BASE_URL):
         self.base_url = base_url
-        self.test_results = []
+        self.test_results: list[CheckResult] = []
         self.jobs_created = []
+        self._log_timestamp = (0, "")
+
+        # Health response from the pre-flight check and when it was fetched
+        self.cached_health: dict | None = None
+        self.cached_health_at = 0.0
+
+        # One pooled client so requests reuse keep-alive connections. The pool covers the
+        # most concurrent requests made (one per worker thread), all kept alive between calls.
+        self.client = httpx.Client(
+            base_url=base_url,
+            limits=httpx.Limits(
+                max_connections=16, max_keepalive_connections=16, keepalive_expiry=60.0
+            ),
+            timeout=httpx.Timeout(connect=5.0, read=30.0, write=30.0, pool=5.0),
+        )
+
+        self._log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+        self._log_listener.start()
+
+    def close(self):
+        """Close the HTTP client and flush queued log lines."""
+        self.client.close()
+        self._log_listener.stop()
 
     def log(self, message: str, level: str = "INFO"):
         """Log messages with timestamp and level."""
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp}] [{level}] {message}")
+        # Format the timestamp once per second; stored as one tuple for worker threads
+        now = int(time.time())
+        second, timestamp = self._log_timestamp
+        if now != second:
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+            self._log_timestamp = (now, timestamp)
+        logger.info(f"[{timestamp}] [{level}] {message}")
 
     def test_endpoint(
         self, name: str, method: str, endpoint: str, expected_status: list[int] = None, **kwargs
@@ -37,19 +112,17 @@ class APITester:
         if expected_status is None:
             expected_status = [200, 201]
 
-        url = f"{self.base_url}{endpoint}"
         test_passed = False
         response_data = None
 
         try:
             self.log(f"Testing: {name} - {method} {endpoint}")
-            with httpx.Client() as client:
-                response = client.request(method, url, **kwargs)
+            response = self.client.request(method, endpoint, **kwargs)
 
             if response.status_code in expected_status:
                 test_passed = True
                 response_data = (
-                    response.json()
+                    orjson.loads(response.content)
                     if response.headers.get("content-type", "").startswith("application/json")
                     else response.content
                 )
@@ -65,27 +138,39 @@ class APITester:
             self.log(f"❌ {name}: FAILED with exception: {str(e)}", "ERROR")
 
         self.test_results.append(
-            {
-                "name": name,
-                "endpoint": endpoint,
-                "method": method,
-                "passed": test_passed,
-                "response": response_data,
-            }
+            CheckResult(
+                name=name,
+                endpoint=endpoint,
+                method=method,
+                passed=test_passed,
+                response=response_data,
+            )
         )
 
         return response_data
 
     def test_health_endpoint(self):
-        """Test the health check endpoint."""
+        """Test the health check endpoint, reusing a recent pre-flight response."""
+        if (
+            self.cached_health is not None
+            and time.monotonic() - self.cached_health_at < HEALTH_CACHE_TTL
+        ):
+            self.log("✅ Health Check: PASSED (pre-flight response)", "SUCCESS")
+            self.test_results.append(
+                CheckResult(
+                    name="Health Check",
+                    endpoint="/api/health",
+                    method="GET",
+                    passed=True,
+                    response=self.cached_health,
+                )
+            )
+            return self.cached_health
+
         return self.test_endpoint("Health Check", "GET", "/api/health")
 
     def test_document_extraction(self, file_path: Path, description: str) -> str | None:
         """Test document extraction for a specific file."""
-        if not file_path.exists():
-            self.log(f"File not found: {file_path}", "WARNING")
-            return None
-
         with open(file_path, "rb") as f:
             files = {"file": (file_path.name, f, "application/octet-stream")}
             result = self.test_endpoint(
@@ -101,10 +186,11 @@ class APITester:
 
     def test_job_status(self, job_id: str, wait_for_completion: bool = True) -> dict | None:
         """Test job status endpoint."""
-        max_attempts = 60  # 60 seconds timeout
-        attempt = 0
+        deadline = time.monotonic() + 120
+        # Poll quickly at first and back off with jitter for long-running jobs
+        interval = 0.1
 
-        while attempt < max_attempts:
+        while time.monotonic() < deadline:
             result = self.test_endpoint(f"Job Status ({job_id})", "GET", f"/api/jobs/{job_id}")
 
             if result:
@@ -114,8 +200,8 @@ class APITester:
                 if not wait_for_completion or status in ["completed", "failed"]:
                     return result
 
-            time.sleep(1)
-            attempt += 1
+            time.sleep(random.uniform(interval * 0.5, interval))
+            interval = min(interval * 1.5, 5.0)
 
         self.log(f"Timeout waiting for job {job_id}", "WARNING")
         return None
@@ -126,49 +212,62 @@ class APITester:
 
     def test_download_results(self, job_id: str, save_path: Path | None = None) -> bool:
         """Test downloading job results as ZIP."""
-        url = f"{self.base_url}/api/extract/{job_id}/download"
-
         try:
             self.log(f"Downloading results for job {job_id}")
-            with httpx.Client() as client:
-                response = client.get(url)
+            # Stream the archive to disk instead of holding it in memory
+            with self.client.stream("GET", f"/api/extract/{job_id}/download") as response:
+                if response.status_code != 200:
+                    self.log(
+                        f"❌ Failed to download results: Status {response.status_code}", "ERROR"
+                    )
+                    return False
 
-            if response.status_code == 200:
                 if save_path is None:
                     save_path = OUTPUT_DIR / f"{job_id}_results.zip"
 
                 save_path.parent.mkdir(parents=True, exist_ok=True)
 
+                started = time.perf_counter()
+                bytes_written = 0
                 with open(save_path, "wb") as f:
-                    f.write(response.content)
-
-                # Verify ZIP file
-                with zipfile.ZipFile(save_path, "r") as zf:
-                    files = zf.namelist()
-                    self.log(f"✅ Downloaded ZIP contains {len(files)} files: {files}", "SUCCESS")
-
-                    # Extract and verify contents
-                    extract_dir = OUTPUT_DIR / f"{job_id}_extracted"
-                    extract_dir.mkdir(parents=True, exist_ok=True)
-                    zf.extractall(extract_dir)
-
-                    # Check for expected files
-                    expected_files = ["content.txt", "meta.txt", "extraction_log.json"]
-                    for expected in expected_files:
-                        if any(expected in f for f in files):
-                            self.log(f"  ✓ Found {expected}")
-                        else:
-                            self.log(f"  ✗ Missing {expected}", "WARNING")
-
-                return True
-            else:
-                self.log(f"❌ Failed to download results: Status {response.status_code}", "ERROR")
-                return False
+                    for chunk in response.iter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        bytes_written += f.write(chunk)
+
+                elapsed = time.perf_counter() - started
+                self.log(
+                    f"Downloaded {bytes_written} bytes in {elapsed:.3f}s "
+                    f"({bytes_written / max(elapsed, 1e-9) / (1024 * 1024):.1f} MB/s)"
+                )
+
+            # Verify ZIP file
+            with zipfile.ZipFile(save_path, "r") as zf:
+                files = zf.namelist()
+                self.log(f"✅ Downloaded ZIP contains {len(files)} files: {files}", "SUCCESS")
+
+                # Extract and verify contents
+                extract_dir = OUTPUT_DIR / f"{job_id}_extracted"
+                extract_dir.mkdir(parents=True, exist_ok=True)
+                zf.extractall(extract_dir)
+
+                # Check for expected files
+                basenames = {Path(name).name for name in files}
+                for expected in EXPECTED_RESULT_FILES:
+                    if expected in basenames:
+                        self.log(f"  ✓ Found {expected}")
+                    else:
+                        self.log(f"  ✗ Missing {expected}", "WARNING")
+
+            return True
 
         except Exception as e:
             self.log(f"❌ Download failed with exception: {str(e)}", "ERROR")
             return False
 
+    def _check_results(self, job_id: str):
+        """Fetch a completed job's result summary and download and verify its ZIP."""
+        self.test_get_job_result(job_id)
+        self.test_download_results(job_id)
+
     def test_get_job_result(self, job_id: str):
         """Test getting job result directly."""
         return self.test_endpoint(f"Get Job Result ({job_id})", "GET", f"/api/jobs/{job_id}/result")
@@ -195,17 +294,14 @@ class APITester:
         self.test_endpoint("Extract without file", "POST", "/api/extract", expected_status=[422])
 
         # Test with invalid file type - should return 400
-        with tempfile.NamedTemporaryFile(suffix=".invalid") as tf:
-            tf.write(b"Invalid file content")
-            tf.seek(0)
-            files = {"file": ("test.invalid", tf, "application/octet-stream")}
-            self.test_endpoint(
-                "Extract invalid file type",
-                "POST",
-                "/api/extract",
-                expected_status=[400],
-                files=files,
-            )
+        files = {"file": ("test.invalid", b"Invalid file content", "application/octet-stream")}
+        self.test_endpoint(
+            "Extract invalid file type",
+            "POST",
+            "/api/extract",
+            expected_status=[400],
+            files=files,
+        )
 
     def run_comprehensive_tests(self):
         """Run all comprehensive API tests."""
@@ -227,30 +323,37 @@ class APITester:
             (TEST_FILES_DIR / "Channai_Madurai.xlsx", "XLSX file"),
         ]
 
-        job_ids = []
-        for file_path, description in test_files:
-            job_id = self.test_document_extraction(file_path, description)
-            if job_id:
-                job_ids.append((job_id, file_path.name))
-
-        # 3. Test list jobs
-        self.test_list_jobs(limit=5)
-
-        # 4. Wait for jobs to complete and test status
-        completed_jobs = []
-        for job_id, filename in job_ids:
-            result = self.test_job_status(job_id, wait_for_completion=True)
-            if result and result.get("status") == "completed":
-                completed_jobs.append((job_id, filename))
+        # Check the files once up front and skip missing ones with a single warning
+        test_files, missing = resolve_test_files(test_files)
+        if missing:
+            self.log(f"Skipping missing test files: {', '.join(map(str, missing))}", "WARNING")
+
+        # Requests are I/O-bound, so upload and poll all files concurrently over the shared client
+        with ThreadPoolExecutor(max_workers=max(1, len(test_files))) as executor:
+            submitted = executor.map(lambda test: self.test_document_extraction(*test), test_files)
+            job_ids = [
+                (job_id, file_path.name)
+                for job_id, (file_path, _) in zip(submitted, test_files, strict=True)
+                if job_id
+            ]
+
+            # 3. Test list jobs
+            self.test_list_jobs(limit=5)
+
+            # 4. Wait for jobs to complete and test status
+            results = executor.map(lambda job: self.test_job_status(job[0]), job_ids)
+            completed_jobs = [
+                job
+                for job, result in zip(job_ids, results, strict=True)
+                if result and result.get("status") == "completed"
+            ]
 
         # 5. Test downloading results for completed jobs
         self.log("\nTesting result downloads...")
-        for job_id, _filename in completed_jobs:
-            # Test getting job result
-            self.test_get_job_result(job_id)
-
-            # Test downloading as ZIP
-            self.test_download_results(job_id)
+        # Each job is checked in its own thread so downloads and zip extraction overlap
+        if completed_jobs:
+            with ThreadPoolExecutor(max_workers=min(8, len(completed_jobs))) as executor:
+                list(executor.map(lambda job: self._check_results(job[0]), completed_jobs))
 
         # 6. Test invalid requests
         self.test_invalid_requests()
@@ -270,7 +373,7 @@ class APITester:
         self.log("=" * 60)
 
         total = len(self.test_results)
-        passed = sum(1 for t in self.test_results if t["passed"])
+        passed = sum(1 for t in self.test_results if t.passed)
         failed = total - passed
 
         self.log(f"Total tests: {total}")
@@ -281,8 +384,8 @@ class APITester:
         if failed > 0:
             self.log("\nFailed tests:")
             for test in self.test_results:
-                if not test["passed"]:
-                    self.log(f"  - {test['name']} ({test['method']} {test['endpoint']})")
+                if not test.passed:
+                    self.log(f"  - {test.name} ({test.method} {test.endpoint})")
 
         # Clean up created jobs
         if self.jobs_created:
@@ -296,22 +399,26 @@ def main():
     # Create output directory
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Check if API is running
+    tester = APITester()
     try:
-        with httpx.Client() as client:
-            response = client.get(f"{API_BASE_URL}/api/health", timeout=5)
-        if response.status_code != 200:
-            print(f"❌ API is not healthy at {API_BASE_URL}")
+        # Check if API is running
+        try:
+            response = tester.client.get("/api/health", timeout=5)
+            if response.status_code != 200:
+                print(f"❌ API is not healthy at {API_BASE_URL}")
+                print("Please start the API server with 'make run' first")
+                sys.exit(1)
+            tester.cached_health = orjson.loads(response.content)
+            tester.cached_health_at = time.monotonic()
+        except (httpx.ConnectError, httpx.TimeoutException):
+            print(f"❌ Cannot connect to API at {API_BASE_URL}")
             print("Please start the API server with 'make run' first")
             sys.exit(1)
-    except (httpx.ConnectError, httpx.TimeoutException):
-        print(f"❌ Cannot connect to API at {API_BASE_URL}")
-        print("Please start the API server with 'make run' first")
-        sys.exit(1)
 
-    # Run tests
-    tester = APITester()
-    success = tester.run_comprehensive_tests()
+        # Run tests
+        success = tester.run_comprehensive_tests()
+    finally:
+        tester.close()
 
     # Exit with appropriate code
     sys.exit(0 if success else 1)
@@ -9,28 +9,85 @@ import subprocess
 import sys
 import time
 import zipfile
+from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 
+from click.testing import CliRunner
+
+from cli.client import cli
+
 API_BASE_URL = os.environ.get("API_URL", "http://localhost:8081")
 TEST_FILES_DIR = Path("tests/test_files")
 OUTPUT_DIR = Path("test_outputs_cli")
 
+# Files every result archive should contain
+EXPECTED_RESULT_FILES = ("content.txt", "meta.txt", "extraction_log.json")
+
+# Test files with these suffixes are sent in the batch test
+BATCH_SUFFIXES = frozenset({".pdf", ".docx", ".xlsx", ".md"})
+
+
+def resolve_test_files(
+    test_files: list[tuple[Path, str]],
+) -> tuple[list[tuple[Path, str]], list[Path]]:
+    """Split (path, description) pairs into those whose file exists and the missing paths."""
+    available, missing = [], []
+    for path, description in test_files:
+        if path.exists():
+            available.append((path, description))
+        else:
+            missing.append(path)
+    return available, missing
+
+
+@dataclass(slots=True)
+class CheckResult:
+    """Outcome of one CLI check."""
+
+    name: str
+    args: list[str]
+    passed: bool
+    stdout: str
+    stderr: str
+
 
 class CLITester:
-    def __init__(self, api_url: str = API_BASE_URL):
+    def __init__(self, api_url: str = API_BASE_URL, exhaustive: bool = False):
         self.api_url = api_url
-        self.test_results = []
+        # Run every extraction mode as its own command instead of one combined run
+        self.exhaustive = exhaustive
+        self.test_results: list[CheckResult] = []
         self.jobs_created = []
+        self._log_timestamp = (0, "")
         self.cli_command = ["uv", "run", "python", "-m", "cli.client"]
+        self.runner = CliRunner()
 
     def log(self, message: str, level: str = "INFO"):
         """Log messages with timestamp and level."""
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        # Format the timestamp once per second
+        now = int(time.time())
+        second, timestamp = self._log_timestamp
+        if now != second:
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+            self._log_timestamp = (now, timestamp)
         print(f"[{timestamp}] [{level}] {message}")
 
-    def run_cli_command(self, args: list[str], timeout: int = 30) -> tuple[bool, str, str]:
-        """Run a CLI command and return success status, stdout, stderr."""
-        full_command = self.cli_command + ["--api-url", self.api_url] + args
+    def run_cli_command(
+        self, args: list[str], timeout: int = 30, in_process: bool = True
+    ) -> tuple[bool, str, str]:
+        """Run a CLI command and return success status, stdout, stderr.
+
+        Commands run in-process by default, skipping interpreter startup and imports;
+        pass in_process=False to run a separate process bounded by `timeout`.
+        """
+        full_args = ["--api-url", self.api_url] + args
+        if in_process:
+            self.log(f"Running CLI: cli.client {' '.join(full_args)}")
+            result = self.runner.invoke(cli, full_args)
+            return result.exit_code == 0, result.stdout, result.stderr
+
+        full_command = self.cli_command + full_args
 
         try:
             self.log(f"Running CLI: {' '.join(full_command)}")
@@ -44,13 +101,21 @@ class CLITester:
             return False, "", str(e)
 
     def test_cli_command(
-        self, name: str, args: list[str], expected_success: bool = True, timeout: int = 30
+        self,
+        name: str,
+        args: list[str],
+        expected_success: bool = True,
+        timeout: int = 30,
+        in_process: bool = True,
     ) -> tuple[bool, str, str]:
         """Test a CLI command and record results."""
-        success, stdout, stderr = self.run_cli_command(args, timeout)
-
-        test_passed = success == expected_success
+        success, stdout, stderr = self.run_cli_command(args, timeout, in_process)
+        self._record_result(name, args, success == expected_success, stdout, stderr)
+        return success, stdout, stderr
 
+    def _record_result(
+        self, name: str, args: list[str], test_passed: bool, stdout: str, stderr: str
+    ) -> None:
         if test_passed:
             self.log(f"✅ {name}: PASSED", "SUCCESS")
         else:
@@ -59,10 +124,19 @@ class CLITester:
                 self.log(f"STDERR: {stderr}", "ERROR")
 
         self.test_results.append(
-            {"name": name, "args": args, "passed": test_passed, "stdout": stdout, "stderr": stderr}
+            CheckResult(name=name, args=args, passed=test_passed, stdout=stdout, stderr=stderr)
         )
 
-        return success, stdout, stderr
+    def _parse_job_id(self, stdout: str) -> str | None:
+        """Find the job ID in extract command output and remember it."""
+        for line in stdout.strip().split("\n"):
+            if "job_id" in line.lower() or "Job ID:" in line or "Job created:" in line:
+                job_id = line.split()[-1]
+                if len(job_id) == 36:  # UUID length
+                    self.jobs_created.append(job_id)
+                    self.log(f"Extracted job ID: {job_id}")
+                    return job_id
+        return None
 
     def test_cli_help(self):
         """Test CLI help command."""
@@ -76,10 +150,6 @@ class CLITester:
         self, file_path: Path, description: str, extra_args: list[str] = None
     ) -> str | None:
         """Test document extraction command."""
-        if not file_path.exists():
-            self.log(f"File not found: {file_path}", "WARNING")
-            return None
-
         args = ["extract", str(file_path)]
         if extra_args:
             args.extend(extra_args)
@@ -87,15 +157,7 @@ class CLITester:
         success, stdout, stderr = self.test_cli_command(f"Extract {description}", args, timeout=60)
 
         if success and stdout:
-            # Try to extract job ID from output
-            lines = stdout.strip().split("\n")
-            for line in lines:
-                if "job_id" in line.lower() or "Job ID:" in line:
-                    job_id = line.split()[-1]
-                    if len(job_id) == 36:  # UUID length
-                        self.jobs_created.append(job_id)
-                        self.log(f"Extracted job ID: {job_id}")
-                        return job_id
+            return self._parse_job_id(stdout)
 
         return None
 
@@ -110,6 +172,23 @@ class CLITester:
             file_path, f"{description} (with download)", ["--wait", "--download", str(output_file)]
         )
 
+    def test_extract_all_modes(self, file_path: Path, description: str) -> str | None:
+        """Run one extraction with --wait and --download, checking each mode's output."""
+        output_file = OUTPUT_DIR / f"{file_path.stem}_results.zip"
+        args = ["extract", str(file_path), "--wait", "--download", str(output_file)]
+        success, stdout, stderr = self.run_cli_command(args, timeout=60)
+        job_id = self._parse_job_id(stdout) if success else None
+
+        checks = [
+            (f"Extract {description}", success and job_id is not None),
+            (f"Extract {description} (with wait)", success and "Processing completed!" in stdout),
+            (f"Extract {description} (with download)", success and output_file.exists()),
+        ]
+        for name, test_passed in checks:
+            self._record_result(name, args, test_passed, stdout, stderr)
+
+        return job_id
+
     def test_status_command(self, job_id: str):
         """Test status command for a job."""
         return self.test_cli_command(f"Status Check ({job_id[:8]}...)", ["status", job_id])
@@ -133,9 +212,9 @@ class CLITester:
                     extract_dir.mkdir(parents=True, exist_ok=True)
                     zf.extractall(extract_dir)
 
-                    expected_files = ["content.txt", "meta.txt", "extraction_log.json"]
-                    for expected in expected_files:
-                        if any(expected in f for f in files):
+                    basenames = {Path(name).name for name in files}
+                    for expected in EXPECTED_RESULT_FILES:
+                        if expected in basenames:
                             self.log(f"    ✓ Found {expected}")
                         else:
                             self.log(f"    ✗ Missing {expected}", "WARNING")
@@ -149,12 +228,19 @@ class CLITester:
         """Test list-jobs command."""
         return self.test_cli_command("List Jobs", ["list-jobs", "--limit", "10"])
 
+    @cached_property
+    def batch_files(self) -> list[str]:
+        """Supported test files, scanned once and sorted for a stable order."""
+        with os.scandir(TEST_FILES_DIR) as entries:
+            return sorted(
+                entry.path
+                for entry in entries
+                if entry.is_file() and Path(entry.name).suffix.lower() in BATCH_SUFFIXES
+            )
+
     def test_batch_processing(self):
         """Test batch processing of multiple files."""
-        batch_files = []
-        for file_path in TEST_FILES_DIR.glob("*"):
-            if file_path.suffix.lower() in [".pdf", ".docx", ".xlsx", ".md"]:
-                batch_files.append(str(file_path))
+        batch_files = self.batch_files
 
         if len(batch_files) < 2:
             self.log("Not enough files for batch testing", "WARNING")
@@ -197,7 +283,7 @@ class CLITester:
         self.log("Testing with invalid API URL...")
         invalid_cli = CLITester("http://invalid-url:9999")
         invalid_cli.test_cli_command(
-            "Health check with invalid URL", ["health"], expected_success=False
+            "Health check with invalid URL", ["health"], expected_success=False, in_process=False
         )
 
     def test_polling_behavior(self):
@@ -234,23 +320,35 @@ class CLITester:
             (TEST_FILES_DIR / "Channai_Madurai.xlsx", "XLSX file"),
         ]
 
-        job_ids = []
+        # Check the files once up front and skip missing ones with a single warning
+        test_files, missing = resolve_test_files(test_files)
+        if missing:
+            self.log(f"Skipping missing test files: {', '.join(map(str, missing))}", "WARNING")
 
-        # Test basic extraction
-        for file_path, description in test_files:
-            job_id = self.test_extract_command(file_path, description)
-            if job_id:
-                job_ids.append(job_id)
-
-        # Test extraction with wait
-        for file_path, description in test_files:
-            job_id = self.test_extract_with_wait(file_path, description)
-            if job_id:
-                job_ids.append(job_id)
+        job_ids = []
 
-        # Test extraction with download
-        for file_path, description in test_files:
-            self.test_extract_with_download(file_path, description)
+        if self.exhaustive:
+            # Test basic extraction
+            for file_path, description in test_files:
+                job_id = self.test_extract_command(file_path, description)
+                if job_id:
+                    job_ids.append(job_id)
+
+            # Test extraction with wait
+            for file_path, description in test_files:
+                job_id = self.test_extract_with_wait(file_path, description)
+                if job_id:
+                    job_ids.append(job_id)
+
+            # Test extraction with download
+            for file_path, description in test_files:
+                self.test_extract_with_download(file_path, description)
+        else:
+            # One run with --wait --download goes through every step of the other modes
+            for file_path, description in test_files:
+                job_id = self.test_extract_all_modes(file_path, description)
+                if job_id:
+                    job_ids.append(job_id)
 
         # 4. Test list jobs
         self.test_list_jobs_command()
@@ -282,7 +380,7 @@ class CLITester:
         self.log("=" * 60)
 
         total = len(self.test_results)
-        passed = sum(1 for t in self.test_results if t["passed"])
+        passed = sum(1 for t in self.test_results if t.passed)
         failed = total - passed
 
         self.log(f"Total tests: {total}")
@@ -293,10 +391,10 @@ class CLITester:
         if failed > 0:
             self.log("\nFailed tests:")
             for test in self.test_results:
-                if not test["passed"]:
-                    self.log(f"  - {test['name']}")
-                    if test["stderr"]:
-                        self.log(f"    Error: {test['stderr']}")
+                if not test.passed:
+                    self.log(f"  - {test.name}")
+                    if test.stderr:
+                        self.log(f"    Error: {test.stderr}")
 
         if self.jobs_created:
             self.log(f"\nCreated {len(self.jobs_created)} jobs during testing")
@@ -322,7 +420,8 @@ def main():
         sys.exit(1)
 
     # Run tests
-    tester = CLITester()
+    # --exhaustive runs each extraction mode as a separate command
+    tester = CLITester(exhaustive="--exhaustive" in sys.argv[1:])
     success = tester.run_comprehensive_tests()
 
     # Exit with appropriate code
@@ -0,0 +1,24 @@
+import pytest
+
+from core.extractors import DOCXExtractor, MarkdownExtractor, PDFExtractor, XLSXExtractor
+
+
+# Extractors keep no per-document state, so one instance of each serves every test
+@pytest.fixture(scope="session")
+def md_extractor():
+    return MarkdownExtractor()
+
+
+@pytest.fixture(scope="session")
+def pdf_extractor():
+    return PDFExtractor()
+
+
+@pytest.fixture(scope="session")
+def docx_extractor():
+    return DOCXExtractor()
+
+
+@pytest.fixture(scope="session")
+def xlsx_extractor():
+    return XLSXExtractor()
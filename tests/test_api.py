@@ -1,15 +1,22 @@
+import io
+import json
 import tempfile
+import time
+import zipfile
 from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
 
+from api.dependencies import get_job_manager
 from api.main import app
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def client():
-    return TestClient(app)
+    # Keep one event loop alive across requests so submitted jobs keep running
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture
@@ -37,6 +44,23 @@ This is a test document for API testing.
     Path(f.name).unlink(missing_ok=True)
 
 
+def wait_for_completion(client, job_id, timeout=30.0):
+    """Long-poll a job until it leaves pending/processing, failing after `timeout` seconds."""
+    deadline = time.monotonic() + timeout
+    response = client.get(f"/api/jobs/{job_id}?wait=10")
+    while response.json()["status"] in ["pending", "processing"]:
+        assert time.monotonic() < deadline, f"job {job_id} did not finish in {timeout}s"
+        response = client.get(f"/api/jobs/{job_id}?wait=10")
+    return response.json()
+
+
+def read_result_zip(client, job_id):
+    response = client.get(f"/api/extract/{job_id}/download")
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
 class TestHealthEndpoint:
     def test_health_check(self, client):
         response = client.get("/api/health")
@@ -98,6 +122,21 @@ class TestJobsEndpoint:
         response = client.get(f"/api/jobs/{fake_job_id}")
         assert response.status_code == 404
 
+    def test_get_job_status_wait_not_found(self, client):
+        fake_job_id = "00000000-0000-0000-0000-000000000000"
+        response = client.get(f"/api/jobs/{fake_job_id}?wait=1")
+        assert response.status_code == 404
+
+        # Long-polls on unknown jobs must not leave wake-up events behind
+        job_manager = client.portal.call(get_job_manager)
+        assert fake_job_id not in job_manager._job_events
+        assert fake_job_id not in job_manager._job_waiters
+
+    def test_get_job_status_invalid_wait(self, client):
+        fake_job_id = "00000000-0000-0000-0000-000000000000"
+        response = client.get(f"/api/jobs/{fake_job_id}?wait=600")  # Exceeds max wait
+        assert response.status_code == 422
+
     def test_get_job_result_not_found(self, client):
         fake_job_id = "00000000-0000-0000-0000-000000000000"
         response = client.get(f"/api/jobs/{fake_job_id}/result")
@@ -120,6 +159,14 @@ class TestJobsEndpoint:
         data = response.json()
         assert len(data["jobs"]) <= 5
 
+    def test_list_jobs_with_status_filter(self, client):
+        response = client.get("/api/jobs?status=failed&limit=5")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert all(job["status"] == "failed" for job in data["jobs"])
+        assert data["total"] >= len(data["jobs"])
+
     def test_list_jobs_invalid_limit(self, client):
         response = client.get("/api/jobs?limit=500")  # Exceeds max limit
         assert response.status_code == 422
@@ -163,6 +210,70 @@ class TestIntegrationFlow:
         # Note: In a real scenario, we'd need to wait for processing to complete
         # For unit tests, we're primarily testing the API structure
 
+    def test_job_status_not_modified(self, client, sample_markdown_file):
+        with open(sample_markdown_file, "rb") as f:
+            response = client.post("/api/extract", files={"file": ("test.md", f, "text/markdown")})
+        job_id = response.json()["job_id"]
+
+        response = client.get(f"/api/jobs/{job_id}")
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+        response = client.get(f"/api/jobs/{job_id}", headers={"If-None-Match": etag})
+        assert response.status_code in [200, 304]  # 200 if the job moved on in between
+        if response.status_code == 304:
+            assert response.content == b""
+
+    def test_download_not_modified(self, client, sample_markdown_file):
+        with open(sample_markdown_file, "rb") as f:
+            response = client.post("/api/extract", files={"file": ("test.md", f, "text/markdown")})
+        job_id = response.json()["job_id"]
+
+        assert wait_for_completion(client, job_id)["status"] == "completed"
+
+        response = client.get(f"/api/extract/{job_id}/download")
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+        response = client.get(f"/api/extract/{job_id}/download", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+
+    def test_duplicate_upload_reuses_results(self, client, sample_markdown_file):
+        job_ids = []
+        for _ in range(2):
+            with open(sample_markdown_file, "rb") as f:
+                response = client.post(
+                    "/api/extract", files={"file": ("test.md", f, "text/markdown")}
+                )
+            job_id = response.json()["job_id"]
+            assert wait_for_completion(client, job_id)["status"] == "completed"
+            job_ids.append(job_id)
+
+        first, second = (read_result_zip(client, job_id) for job_id in job_ids)
+
+        log = json.loads(second["extraction_log.json"])
+        assert log["reused_from_job"] == job_ids[0]
+        assert second["content.txt"] == first["content.txt"]
+
+        # meta.txt keeps the document's details but describes the second upload
+        document_lines = ("Author:", "Title:", "Subject:", "Keywords:", "Pages:", "Document")
+        first_meta = first["meta.txt"].decode().split("\n")
+        second_meta = second["meta.txt"].decode().split("\n")
+        assert any(line.startswith("Title: ") and line != "Title: N/A" for line in first_meta)
+        first_document = first_meta[first_meta.index("Document Properties:") :]
+        assert second_meta[second_meta.index("Document Properties:") :] == first_document
+        assert [line for line in second_meta if line.startswith(document_lines)] == [
+            line for line in first_meta if line.startswith(document_lines)
+        ]
+        assert [line for line in second_meta if line.startswith("Filename:")] != [
+            line for line in first_meta if line.startswith("Filename:")
+        ]
+        assert (
+            log["document_metadata"]
+            == json.loads(first["extraction_log.json"])["document_metadata"]
+        )
+
     def test_error_handling_malformed_file(self, client):
         # Create a file that looks like markdown but might cause extraction issues
         malformed_content = b"\x00\x01\x02This is not valid markdown\xff\xfe"
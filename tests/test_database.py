@@ -0,0 +1,56 @@
+import sqlite3
+
+from sqlalchemy import create_engine
+
+from core import database
+
+# The jobs table as created before content_hash was added
+OLD_JOBS_SCHEMA = """
+CREATE TABLE jobs (
+    job_id VARCHAR NOT NULL,
+    status VARCHAR(10) NOT NULL,
+    filename VARCHAR NOT NULL,
+    file_size INTEGER NOT NULL,
+    file_type VARCHAR NOT NULL,
+    created_at DATETIME NOT NULL,
+    started_at DATETIME,
+    completed_at DATETIME,
+    error_message TEXT,
+    output_path VARCHAR,
+    text_length INTEGER,
+    images_count INTEGER,
+    extractor_used VARCHAR,
+    processing_time FLOAT,
+    PRIMARY KEY (job_id)
+)
+"""
+
+
+class TestSchemaUpgrade:
+    def test_add_missing_columns_to_old_schema(self, tmp_path, monkeypatch):
+        db_path = tmp_path / "jobs.db"
+        connection = sqlite3.connect(db_path)
+        connection.execute(OLD_JOBS_SCHEMA)
+        connection.execute(
+            "INSERT INTO jobs (job_id, status, filename, file_size, file_type, created_at) "
+            "VALUES ('old-job', 'COMPLETED', 'old.md', 10, '.md', '2024-01-01 00:00:00')"
+        )
+        connection.commit()
+        connection.close()
+
+        engine = create_engine(f"sqlite:///{db_path}")
+        monkeypatch.setattr(database, "engine", engine)
+        try:
+            database._add_missing_columns()
+            # A second run finds nothing to add
+            database._add_missing_columns()
+        finally:
+            engine.dispose()
+
+        connection = sqlite3.connect(db_path)
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(jobs)")}
+        row = connection.execute("SELECT job_id, content_hash FROM jobs").fetchone()
+        connection.close()
+
+        assert columns == {column.name for column in database.Job.__table__.columns}
+        assert row == ("old-job", None)
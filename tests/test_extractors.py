@@ -1,6 +1,9 @@
-import tempfile
+import mmap
 from pathlib import Path
 
+import pytest
+import yaml
+
 from core.extractors import (
     DOCXExtractor,
     MarkdownExtractor,
@@ -8,96 +11,114 @@ from core.extractors import (
     XLSXExtractor,
     extractor_factory,
 )
+from core.extractors import markdown_extractor as markdown_extractor_module
+from core.extractors import xlsx_extractor as xlsx_extractor_module
 
+SAMPLE_MD = Path("tests/test_files/sample.md")
+SAMPLE_XLSX = Path("tests/test_files/Channai_Madurai.xlsx")
 
-class TestExtractorFactory:
-    def test_get_supported_extensions(self):
-        extensions = extractor_factory.get_supported_extensions()
-        expected_extensions = [
-            ".pdf",
-            ".docx",
-            ".doc",
-            ".xlsx",
-            ".xls",
-            ".md",
-            ".markdown",
-            ".mdown",
-            ".mkd",
-        ]
-
-        for ext in expected_extensions:
-            assert ext in extensions
-
-    def test_create_extractor_pdf(self):
-        pdf_file = Path("test.pdf")
-        extractor = extractor_factory.create_extractor(pdf_file)
-        assert isinstance(extractor, PDFExtractor)
-
-    def test_create_extractor_docx(self):
-        docx_file = Path("test.docx")
-        extractor = extractor_factory.create_extractor(docx_file)
-        assert isinstance(extractor, DOCXExtractor)
-
-    def test_create_extractor_xlsx(self):
-        xlsx_file = Path("test.xlsx")
-        extractor = extractor_factory.create_extractor(xlsx_file)
-        assert isinstance(extractor, XLSXExtractor)
-
-    def test_create_extractor_markdown(self):
-        md_file = Path("test.md")
-        extractor = extractor_factory.create_extractor(md_file)
-        assert isinstance(extractor, MarkdownExtractor)
-
-    def test_create_extractor_unsupported(self):
-        unsupported_file = Path("test.txt")
-        extractor = extractor_factory.create_extractor(unsupported_file)
-        assert extractor is None
 
+@pytest.fixture(scope="module")
+def extract_root(tmp_path_factory):
+    """One temporary directory shared by every extraction in this module."""
+    return tmp_path_factory.mktemp("extract")
 
-class TestMarkdownExtractor:
-    def test_can_extract_md_files(self):
-        extractor = MarkdownExtractor()
 
-        assert extractor.can_extract(Path("test.md"))
-        assert extractor.can_extract(Path("test.markdown"))
-        assert extractor.can_extract(Path("test.mdown"))
-        assert extractor.can_extract(Path("test.mkd"))
-        assert not extractor.can_extract(Path("test.txt"))
+@pytest.fixture
+def output_dir(extract_root, request):
+    output_dir = extract_root / request.node.name
+    output_dir.mkdir()
+    return output_dir
 
-    def test_extract_sample_markdown(self):
-        extractor = MarkdownExtractor()
 
-        # Use the sample markdown file
-        sample_file = Path("tests/test_files/sample.md")
+@pytest.fixture(scope="module")
+def sample_md_result(extract_root, md_extractor):
+    """Extract the sample markdown file once for every test that inspects the result."""
+    output_dir = extract_root / "sample_md"
+    output_dir.mkdir()
+    return md_extractor.extract(SAMPLE_MD, output_dir), output_dir
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            output_dir = Path(temp_dir)
 
-            result = extractor.extract(sample_file, output_dir)
+@pytest.fixture(scope="module")
+def sample_md_text():
+    """Sample markdown content, read from disk once for the string-based parsers."""
+    return SAMPLE_MD.read_text(encoding="utf-8")
 
-            assert result.success
-            assert result.error is None
-            assert len(result.text) > 0
-            assert "Sample Markdown Document" in result.text
-            assert "Test Author" in result.text
 
-            # Check metadata
-            assert result.metadata["title"] == "Sample Markdown Document"
-            assert result.metadata["author"] == "Test Author"
-            assert "test" in result.metadata["keywords"]
+class TestExtractorFactory:
+    PDF_FILE = Path("test.pdf")
+    DOCX_FILE = Path("test.docx")
+    XLSX_FILE = Path("test.xlsx")
+    MD_FILE = Path("test.md")
+    UNSUPPORTED_FILE = Path("test.txt")
+    EXPECTED_EXTENSIONS = frozenset(
+        {".pdf", ".docx", ".doc", ".xlsx", ".xls", ".md", ".markdown", ".mdown", ".mkd"}
+    )
 
-            # Check files were created
-            assert (output_dir / "content.txt").exists()
-            assert (output_dir / "meta.txt").exists()
+    def test_get_supported_extensions(self):
+        extensions = extractor_factory.get_supported_extensions()
+        assert self.EXPECTED_EXTENSIONS.issubset(extensions)
+
+    @pytest.mark.parametrize(
+        "file_path,extractor_class",
+        [
+            (PDF_FILE, PDFExtractor),
+            (DOCX_FILE, DOCXExtractor),
+            (XLSX_FILE, XLSXExtractor),
+            (MD_FILE, MarkdownExtractor),
+        ],
+    )
+    def test_create_extractor(self, file_path, extractor_class):
+        extractor = extractor_factory.create_extractor(file_path)
+        assert isinstance(extractor, extractor_class)
 
-            # Verify meta.txt content
-            meta_content = (output_dir / "meta.txt").read_text()
-            assert "Sample Markdown Document" in meta_content
-            assert "Test Author" in meta_content
+    def test_create_extractor_unsupported(self):
+        extractor = extractor_factory.create_extractor(self.UNSUPPORTED_FILE)
+        assert extractor is None
 
-    def test_extract_front_matter(self):
-        extractor = MarkdownExtractor()
 
+class TestMarkdownExtractor:
+    @pytest.mark.parametrize(
+        "ext,expected",
+        [(".md", True), (".markdown", True), (".mdown", True), (".mkd", True), (".txt", False)],
+    )
+    def test_can_extract_md_files(self, md_extractor, ext, expected):
+        assert md_extractor.can_extract(Path(f"test{ext}")) is expected
+
+    @pytest.mark.integration
+    def test_extract_sample_markdown(self, sample_md_result):
+        result, _ = sample_md_result
+
+        assert result.success
+        assert result.error is None
+        assert len(result.text) > 0
+        assert "Sample Markdown Document" in result.text
+        assert "Test Author" in result.text
+
+    @pytest.mark.integration
+    def test_sample_markdown_metadata(self, sample_md_result):
+        result, _ = sample_md_result
+
+        assert result.metadata["title"] == "Sample Markdown Document"
+        assert result.metadata["author"] == "Test Author"
+        assert "test" in result.metadata["keywords"]
+
+    @pytest.mark.integration
+    def test_sample_markdown_output_files(self, sample_md_result):
+        _, output_dir = sample_md_result
+
+        assert (output_dir / "content.txt").exists()
+        assert (output_dir / "meta.txt").exists()
+
+        # Search meta.txt in place rather than decoding all of it
+        with (
+            open(output_dir / "meta.txt", "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as meta_content,
+        ):
+            assert meta_content.find(b"Sample Markdown Document") != -1
+            assert meta_content.find(b"Test Author") != -1
+
+    def test_extract_front_matter(self, md_extractor):
         yaml_content = """---
 title: Test Document
 author: John Doe
@@ -108,66 +129,252 @@ tags: [test, demo]
 
 This is the body."""
 
-        front_matter, body = extractor.extract_front_matter(yaml_content)
+        front_matter, body = md_extractor.extract_front_matter(yaml_content)
 
         assert front_matter["title"] == "Test Document"
         assert front_matter["author"] == "John Doe"
         assert front_matter["tags"] == ["test", "demo"]
         assert "# Content" in body
 
-    def test_extract_headers(self):
-        extractor = MarkdownExtractor()
+    def test_front_matter_uses_libyaml(self):
+        if not yaml.__with_libyaml__:
+            pytest.skip("PyYAML built without libyaml")
+        assert markdown_extractor_module._YAML_LOADER is yaml.CSafeLoader
+
+    def test_sample_front_matter_and_headers(self, md_extractor, sample_md_text):
+        front_matter, body = md_extractor.extract_front_matter(sample_md_text)
+
+        assert front_matter["title"] == "Sample Markdown Document"
+        assert front_matter["tags"] == ["test", "sample", "markdown"]
 
+        headers = md_extractor.extract_headers(body)
+        assert headers[0] == "Sample Markdown Document"
+        assert "  Features Demonstrated" in headers
+
+    def test_extract_headers(self, md_extractor):
         content = """# Main Title
 ## Subtitle
 ### Sub-subtitle
 Regular text
 ## Another Subtitle"""
 
-        headers = extractor.extract_headers(content)
+        headers = md_extractor.extract_headers(content)
 
-        assert len(headers) == 4
-        assert "Main Title" in headers[0]
-        assert "  Subtitle" in headers[1]
-        assert "    Sub-subtitle" in headers[2]
-        assert "  Another Subtitle" in headers[3]
+        assert headers == ["Main Title", "  Subtitle", "    Sub-subtitle", "  Another Subtitle"]
 
+    @pytest.mark.bench
+    def test_extract_headers_benchmark(self, md_extractor, request):
+        pytest.importorskip("pytest_benchmark")
+        benchmark = request.getfixturevalue("benchmark")
+        # 100k headers, interleaved with 50k body lines
+        content = "# H1\n## H2\ntext\n" * 50000
 
-class TestPDFExtractor:
-    def test_can_extract_pdf_files(self):
-        extractor = PDFExtractor()
+        headers = benchmark(md_extractor.extract_headers, content)
 
-        assert extractor.can_extract(Path("test.pdf"))
-        assert not extractor.can_extract(Path("test.doc"))
+        assert len(headers) == 100000
 
-    def test_supported_extensions(self):
-        extractor = PDFExtractor()
-        assert ".pdf" in extractor.supported_extensions
+    def test_markdown_to_text(self, md_extractor):
+        content = """# Title
 
+Some **bold** and `code` text.
 
-class TestDOCXExtractor:
-    def test_can_extract_docx_files(self):
-        extractor = DOCXExtractor()
+```python
+x = 1
+```"""
 
-        assert extractor.can_extract(Path("test.docx"))
-        assert extractor.can_extract(Path("test.doc"))
-        assert not extractor.can_extract(Path("test.pdf"))
+        text = md_extractor.markdown_to_text(content)
 
-    def test_supported_extensions(self):
-        extractor = DOCXExtractor()
-        assert ".docx" in extractor.supported_extensions
-        assert ".doc" in extractor.supported_extensions
+        assert text == "Title\nSome bold and code text.\nx = 1"
 
+    def test_markdown_to_text_keeps_html_text(self, md_extractor):
+        content = """Intro with <abbr title="HyperText">HTML</abbr> &amp; more.
+
+<div class="note">
+  <p>Boxed <b>text</b></p>
+  <script>ignored()</script>
+</div>
+
+<!-- a comment -->"""
+
+        text = md_extractor.markdown_to_text(content)
+
+        assert text == "Intro with HTML & more.\nBoxed text"
+
+
+# Set equality catches unexpected extensions as well as missing ones
+@pytest.mark.parametrize(
+    "extractor_fixture,extensions",
+    [
+        ("md_extractor", {".md", ".markdown", ".mdown", ".mkd"}),
+        ("pdf_extractor", {".pdf"}),
+        ("docx_extractor", {".docx", ".doc"}),
+        ("xlsx_extractor", {".xlsx", ".xls"}),
+    ],
+)
+def test_supported_extensions(request, extractor_fixture, extensions):
+    extractor = request.getfixturevalue(extractor_fixture)
+    assert set(extractor.supported_extensions) == extensions
 
-class TestXLSXExtractor:
-    def test_can_extract_xlsx_files(self):
-        extractor = XLSXExtractor()
 
-        assert extractor.can_extract(Path("test.xlsx"))
-        assert extractor.can_extract(Path("test.xls"))
-        assert not extractor.can_extract(Path("test.pdf"))
+class TestPDFExtractor:
+    @pytest.mark.parametrize("ext,expected", [(".pdf", True), (".doc", False)])
+    def test_can_extract_pdf_files(self, pdf_extractor, ext, expected):
+        assert pdf_extractor.can_extract(Path(f"test{ext}")) is expected
+
+    @pytest.mark.integration
+    def test_extract_page_images(self, pdf_extractor, output_dir):
+        import io
+
+        import fitz
+        from PIL import Image
+
+        def encode(mode, color, image_format):
+            buffer = io.BytesIO()
+            Image.new(mode, (8, 8), color).save(buffer, image_format)
+            return buffer.getvalue()
+
+        rgb_jpeg = encode("RGB", (0, 255, 0), "JPEG")
+        doc = fitz.open()
+        page = doc.new_page()
+        # The alpha channel is stored as a separate soft mask
+        page.insert_image(fitz.Rect(0, 0, 50, 50), stream=encode("RGBA", (255, 0, 0, 128), "PNG"))
+        page.insert_image(fitz.Rect(60, 0, 110, 50), stream=rgb_jpeg)
+        page.insert_image(fitz.Rect(120, 0, 170, 50), stream=encode("CMYK", (0, 0, 0, 0), "JPEG"))
+        file_path = output_dir / "images.pdf"
+        doc.save(file_path)
+        doc.close()
+
+        result = pdf_extractor.extract(file_path, output_dir)
+
+        assert result.success
+        assert [Path(image).name for image in result.images] == [
+            "page_1_img_1.png",
+            "page_1_img_2.jpeg",
+            "page_1_img_3.png",
+        ]
+        with Image.open(result.images[0]) as image:
+            assert image.mode == "RGBA"
+            assert image.getpixel((0, 0))[3] == 128
+        assert Path(result.images[1]).read_bytes() == rgb_jpeg
+        with Image.open(result.images[2]) as image:
+            assert image.mode == "RGB"
+
+
+class TestDOCXExtractor:
+    @pytest.mark.parametrize("ext,expected", [(".docx", True), (".doc", True), (".pdf", False)])
+    def test_can_extract_docx_files(self, docx_extractor, ext, expected):
+        assert docx_extractor.can_extract(Path(f"test{ext}")) is expected
+
+
+class TestXLSXExtractor:
+    @pytest.mark.parametrize("ext,expected", [(".xlsx", True), (".xls", True), (".pdf", False)])
+    def test_can_extract_xlsx_files(self, xlsx_extractor, ext, expected):
+        assert xlsx_extractor.can_extract(Path(f"test{ext}")) is expected
+
+    @pytest.mark.integration
+    def test_extract_sparse_sheet(self, xlsx_extractor, output_dir):
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        worksheet = workbook.active
+        worksheet["A1"] = "header"
+        worksheet["C5000"] = "far away"
+
+        file_path = output_dir / "sparse.xlsx"
+        workbook.save(file_path)
+
+        result = xlsx_extractor.extract(file_path, output_dir)
+
+        assert result.success
+        assert "header" in result.text
+        assert " |  | far away" in result.text
+        assert (output_dir / "content.txt").read_text(encoding="utf-8") == result.text
+
+    @pytest.mark.integration
+    def test_extract_sheet_images(self, xlsx_extractor, output_dir):
+        from openpyxl import Workbook
+        from openpyxl.drawing.image import Image as XLImage
+        from PIL import Image
+
+        png_path = output_dir / "pixel.png"
+        Image.new("RGB", (4, 4), "red").save(png_path)
+        workbook = Workbook()
+        workbook.active["A1"] = "first"
+        workbook.active.add_image(XLImage(png_path), "B2")
+        workbook.create_sheet("Second").add_image(XLImage(png_path), "A1")
+
+        file_path = output_dir / "images.xlsx"
+        workbook.save(file_path)
+        result = xlsx_extractor.extract(file_path, output_dir)
+
+        assert result.success
+        assert [Path(image).name for image in result.images] == [
+            "xlsx_sheet_1_img_1.png",
+            "xlsx_sheet_2_img_1.png",
+        ]
+        assert Path(result.images[0]).read_bytes() == png_path.read_bytes()
+
+    @pytest.mark.integration
+    def test_parallel_sheets_match_sequential(self, xlsx_extractor, output_dir, monkeypatch):
+        from openpyxl import Workbook
+        from openpyxl.drawing.image import Image as XLImage
+        from PIL import Image
+
+        png_path = output_dir / "pixel.png"
+        Image.new("RGB", (4, 4), "red").save(png_path)
+        workbook = Workbook()
+        workbook.active["A1"] = "first"
+        second = workbook.create_sheet("Second")
+        second["A1"] = "second"
+        second.add_image(XLImage(png_path), "B2")
+        file_path = output_dir / "sheets.xlsx"
+        workbook.save(file_path)
+
+        monkeypatch.setattr(xlsx_extractor_module, "CalamineWorkbook", None)
+        sequential_dir = output_dir / "sequential"
+        sequential_dir.mkdir()
+        sequential_result = xlsx_extractor.extract(file_path, sequential_dir)
+
+        # Each sheet on its own gives the lines the sequential pass wrote for it
+        images_dir = output_dir / "images"
+        images_dir.mkdir()
+        sheets = [xlsx_extractor_module._extract_sheet(file_path, i, images_dir) for i in (0, 1)]
+        assert "\n".join(line for lines, _ in sheets for line in lines) == sequential_result.text
+        assert [Path(image).name for _, images in sheets for image in images] == [
+            "xlsx_sheet_2_img_1.png"
+        ]
 
-    def test_supported_extensions(self):
-        extractor = XLSXExtractor()
-        assert ".xlsx" in extractor.supported_extensions
-        assert ".xls" in extractor.supported_extensions
+        monkeypatch.setattr(xlsx_extractor_module, "PARALLEL_SHEETS_MIN_BYTES", 0)
+        monkeypatch.setattr(xlsx_extractor_module, "SHEET_WORKERS", 2)
+        parallel_dir = output_dir / "parallel"
+        parallel_dir.mkdir()
+        parallel_result = xlsx_extractor.extract(file_path, parallel_dir)
+
+        assert parallel_result.success
+        assert parallel_result.text == sequential_result.text
+        assert [Path(image).name for image in parallel_result.images] == ["xlsx_sheet_2_img_1.png"]
+
+    @pytest.mark.integration
+    def test_extract_sample_xlsx(self, xlsx_extractor, output_dir):
+        result = xlsx_extractor.extract(SAMPLE_XLSX, output_dir)
+
+        assert result.success
+        assert result.error is None
+        assert "=== Sheet: HighLowTemperature ===" in result.text
+        assert "Date | Day | City | Highest Temp" in result.text
+        assert result.metadata["document_properties"]["sheets_count"] == 3
+
+    @pytest.mark.integration
+    def test_calamine_matches_openpyxl(self, xlsx_extractor, output_dir, monkeypatch):
+        pytest.importorskip("python_calamine")
+        calamine_dir = output_dir / "calamine"
+        calamine_dir.mkdir()
+        calamine_result = xlsx_extractor.extract(SAMPLE_XLSX, calamine_dir)
+
+        monkeypatch.setattr(xlsx_extractor_module, "CalamineWorkbook", None)
+        openpyxl_dir = output_dir / "openpyxl"
+        openpyxl_dir.mkdir()
+        openpyxl_result = xlsx_extractor.extract(SAMPLE_XLSX, openpyxl_dir)
+
+        assert calamine_result.success
+        assert calamine_result.text == openpyxl_result.text